@@ -1,20 +1,26 @@
 import argparse
-import webbrowser
 import os
 import platform
 import sys
-import concurrent.futures
 
-from .config import load_config, prompt_first_run, save_config, Config, get_logs_dir
-from .sync import run_sync_once, run_sync, run_sync_validate_first
-from .scheduler import install_macos_launchagent, uninstall_macos_launchagent, install_systemd_user, uninstall_systemd_user
-from .olbrowser_login import login_via_qt
-from .status import cmd_status
+# Only config is imported eagerly; sync/status/scheduler (and through them
+# pyoverleaf/requests) are imported by the commands that need them.
+from .config import load_config, prompt_first_run, get_config, save_config, editing_config, Config
+
+_OS_NAME = platform.system()
 
 
 def cmd_init(args):
     cfg = load_config()
-    if cfg is None:
+    if cfg is None and args.from_json:
+        from .config import config_from_json
+
+        try:
+            cfg = config_from_json(sys.stdin.read())
+        except ValueError as e:
+            print(f"Invalid config JSON: {e}")
+            sys.exit(2)
+    elif cfg is None:
         cfg = prompt_first_run()
     else:
         print("Config already exists; run with --reset to reconfigure.")
@@ -24,7 +30,9 @@ def cmd_init(args):
 
 
 def install_scheduler(cfg: Config, mode: str = "dynamic"):
-    os_name = platform.system()
+    from .scheduler import install_macos_launchagent, install_systemd_user
+
+    os_name = _OS_NAME
     interval = cfg.sync_interval
     if os_name == "Darwin":
         install_macos_launchagent(interval, mode)
@@ -36,7 +44,9 @@ def install_scheduler(cfg: Config, mode: str = "dynamic"):
 
 
 def uninstall_scheduler():
-    os_name = platform.system()
+    from .scheduler import uninstall_macos_launchagent, uninstall_systemd_user
+
+    os_name = _OS_NAME
     if os_name == "Darwin":
         uninstall_macos_launchagent()
     else:
@@ -44,7 +54,9 @@ def uninstall_scheduler():
 
 
 def cmd_install(args):
-    cfg = load_config() or prompt_first_run()
+    cfg = get_config()
+    from .sync import run_sync_validate_first
+
     # Run a manual sync first to validate config and access
     try:
         print("Running a validation sync before installing scheduler...")
@@ -70,15 +82,17 @@ def cmd_uninstall(args):
 
 def cmd_run_once(args):
     # Manual run always full sync
+    from .sync import run_sync_once
+
     run_sync_once()
 
 def cmd_run_once_dynamic(args):
     # Dynamic, selective, for scheduler use only
-    cfg = load_config() or prompt_first_run()
+    cfg = get_config()
     from .sync import due_run
     due_run(cfg)
 def cmd_sync(args):
-    cfg = load_config() or prompt_first_run()
+    cfg = get_config()
     # Apply one-off overrides
     if getattr(args, "count", None):
         cfg.count = args.count
@@ -88,12 +102,16 @@ def cmd_sync(args):
         cfg.browser = args.browser
     if getattr(args, "profile", None):
         cfg.profile = args.profile
+    if getattr(args, "jobs", None):
+        cfg.jobs = args.jobs
+    from .sync import run_sync
+
     run_sync(cfg)
 
 
 
 def cmd_set_interval(args):
-    cfg = load_config() or prompt_first_run()
+    cfg = get_config()
     val = args.interval
     if val not in ("30m", "1h", "12h", "24h"):
         print("Invalid interval; choose 30m, 1h, 12h, or 24h")
@@ -104,21 +122,19 @@ def cmd_set_interval(args):
 
 
 def cmd_set_count(args):
-    cfg = load_config() or prompt_first_run()
-    cfg.count = args.count
-    save_config(cfg)
+    with editing_config() as cfg:
+        cfg.count = args.count
     print("Updated latest projects count.")
 
 
 def cmd_set_base_dir(args):
-    cfg = load_config() or prompt_first_run()
-    cfg.base_dir = args.base_dir
-    save_config(cfg)
+    with editing_config() as cfg:
+        cfg.base_dir = args.base_dir
     print("Updated base directory.")
 
 
 def cmd_set_cookie(args):
-    cfg = load_config() or prompt_first_run()
+    cfg = get_config()
     value = args.value
     if not value:
         print("Paste cookie string, then press Ctrl-D (EOF):")
@@ -139,14 +155,13 @@ def cmd_set_cookie(args):
 
 
 def cmd_clear_cookie(args):
-    cfg = load_config() or prompt_first_run()
-    cfg.cookies = None
-    save_config(cfg)
+    with editing_config() as cfg:
+        cfg.cookies = None
     print("Cleared stored cookies from config.")
 
 
 def cmd_set_git_token(args):
-    cfg = load_config() or prompt_first_run()
+    cfg = get_config()
     token = args.value
     if not token:
         try:
@@ -162,14 +177,13 @@ def cmd_set_git_token(args):
 
 
 def cmd_clear_git_token(args):
-    cfg = load_config() or prompt_first_run()
-    cfg.git_token = None
-    save_config(cfg)
+    with editing_config() as cfg:
+        cfg.git_token = None
     print("Cleared Overleaf Git token from config.")
 
 
 def cmd_set_name_suffix(args):
-    cfg = load_config() or prompt_first_run()
+    cfg = get_config()
     val = args.value.lower()
     if val not in ("on", "off"):
         print("Invalid value; use 'on' or 'off'")
@@ -182,12 +196,32 @@ def cmd_set_name_suffix(args):
     
 
 
+def cmd_status(args):
+    from .status import cmd_status as _cmd_status
+
+    _cmd_status(args)
+
+
+def _validate_cookies(cfg: Config) -> None:
+    """Quick cookie check: one project-list request, no git clones or pulls."""
+    try:
+        from .overleaf_api import create_api_cached, list_projects_sorted_by_last_updated
+
+        api = create_api_cached(cfg.host, cfg.cookies or {})
+        projects = list_projects_sorted_by_last_updated(api, cfg.cookies or {}, cfg.count)
+        print(f"Cookie validation succeeded ({len(projects)} project(s) visible). Run 'overleaf-pull sync' to pull them.")
+    except Exception as e:
+        print(f"Validation failed (will keep cookies saved): {e}")
+
+
 def cmd_browser_login(args):
     """Guide the user to obtain cookies via the browser (manual copy)."""
-    cfg = load_config() or prompt_first_run()
+    cfg = get_config()
     url = f"https://{cfg.host}/project"
     print("Opening Overleaf in your default browser. If not logged in, please log in.")
     try:
+        import webbrowser
+
         webbrowser.open(url)
     except Exception:
         print(f"Please open {url} manually.")
@@ -210,19 +244,16 @@ def cmd_browser_login(args):
         cfg.cookies = parse_cookie_string(value)
         save_config(cfg)
         print("Stored cookies in config.")
-        # Optional quick validation
-        try:
-            run_sync(cfg)
-            print("Cookie validation succeeded (projects synced).")
-        except Exception as e:
-            print(f"Validation failed (will keep cookies saved): {e}")
+        _validate_cookies(cfg)
     except Exception as e:
         print(f"Failed to parse cookies: {e}")
 
 
 def cmd_browser_login_qt(args):
     """Open a Qt WebEngine window to login and capture cookies automatically."""
-    cfg = load_config() or prompt_first_run()
+    cfg = get_config()
+    from .olbrowser_login import login_via_qt
+
     try:
         store = login_via_qt()
     except RuntimeError as e:
@@ -238,84 +269,99 @@ def cmd_browser_login_qt(args):
     if missing:
         print(f"Warning: missing expected cookie(s): {', '.join(missing)}")
     print("Stored cookies from Qt browser login.")
-    # Optional quick validation
-    try:
-        run_sync(cfg)
-        print("Cookie validation succeeded (projects synced).")
-    except Exception as e:
-        print(f"Validation failed (will keep cookies saved): {e}")
+    _validate_cookies(cfg)
 
 
-def main():
-    parser = argparse.ArgumentParser(prog="overleaf-pull", description="Pull-only Overleaf project sync")
-    sub = parser.add_subparsers(dest="cmd")
+def _args_install(p):
+    p.add_argument("--install", action="store_true", help="Install background scheduler after setup")
+    p.add_argument("--from-json", action="store_true", help="Read the config as one JSON object (Config field names) from stdin instead of prompting")
 
-    p_init = sub.add_parser("init", help="First-run setup and optional scheduler install")
-    p_init.add_argument("--install", action="store_true", help="Install background scheduler after setup")
-    p_init.set_defaults(func=cmd_init)
 
-    p_install = sub.add_parser("install-scheduler", help="Install background scheduler (LaunchAgent/systemd)")
-    p_install.add_argument("--mode", choices=["dynamic", "full"], default="dynamic", help="Scheduler run mode: dynamic (per-project timers) or full (always sync all)")
-    p_install.set_defaults(func=cmd_install)
+def _args_install_scheduler(p):
+    p.add_argument("--mode", choices=["dynamic", "full"], default="dynamic", help="Scheduler run mode: dynamic (per-project timers) or full (always sync all)")
 
-    p_uninstall = sub.add_parser("uninstall-scheduler", help="Uninstall background scheduler")
-    p_uninstall.set_defaults(func=cmd_uninstall)
 
-    p_run = sub.add_parser("run-once", help="Run a single pull-only sync now (always full)")
-    p_run.set_defaults(func=cmd_run_once)
+def _args_sync(p):
+    p.add_argument("--count", type=int, help="Override latest projects count for this run")
+    p.add_argument("--base-dir", help="Override base directory for this run")
+    p.add_argument("--browser", choices=["safari", "firefox"], help="Override browser for this run")
+    p.add_argument("--profile", help="Override profile for this run")
+    p.add_argument("--jobs", type=int, help="Max projects to sync concurrently for this run (default 8)")
 
-    # Hidden entry for scheduler dynamic mode
-    p_run_dyn = sub.add_parser("run-once-dynamic")
-    p_run_dyn.set_defaults(func=cmd_run_once_dynamic)
 
-    p_sync = sub.add_parser("sync", help="Manual sync with optional overrides")
-    p_sync.add_argument("--count", type=int, help="Override latest projects count for this run")
-    p_sync.add_argument("--base-dir", help="Override base directory for this run")
-    p_sync.add_argument("--browser", choices=["safari", "firefox"], help="Override browser for this run")
-    p_sync.add_argument("--profile", help="Override profile for this run")
-    p_sync.set_defaults(func=cmd_sync)
+def _args_set_interval(p):
+    p.add_argument("interval", choices=["30m", "1h", "12h", "24h"])
+
+
+def _args_set_count(p):
+    p.add_argument("count", type=int)
+
 
-    p_si = sub.add_parser("set-interval", help="Set sync interval (30m|1h|12h|24h)")
-    p_si.add_argument("interval", choices=["30m", "1h", "12h", "24h"])
-    p_si.set_defaults(func=cmd_set_interval)
+def _args_set_base_dir(p):
+    p.add_argument("base_dir")
 
-    p_sc = sub.add_parser("set-count", help="Set latest projects count")
-    p_sc.add_argument("count", type=int)
-    p_sc.set_defaults(func=cmd_set_count)
 
-    p_sb = sub.add_parser("set-base-dir", help="Set base directory for clones")
-    p_sb.add_argument("base_dir")
-    p_sb.set_defaults(func=cmd_set_base_dir)
+def _args_set_cookie(p):
+    p.add_argument("value", nargs="?", help="Cookie header or 'name=value; name2=value2' string")
 
-    p_scook = sub.add_parser("set-cookie", help="Store Overleaf cookies in config (paste or pass string)")
-    p_scook.add_argument("value", nargs="?", help="Cookie header or 'name=value; name2=value2' string")
-    p_scook.set_defaults(func=cmd_set_cookie)
 
-    p_ccook = sub.add_parser("clear-cookie", help="Clear stored cookies from config")
-    p_ccook.set_defaults(func=cmd_clear_cookie)
+def _args_status(p):
+    p.add_argument("--prune", action="store_true", help="Remove old local projects not in latest set if safe")
 
-    p_status = sub.add_parser("status", help="Show current sync state; optional prune old projects")
-    p_status.add_argument("--prune", action="store_true", help="Remove old local projects not in latest set if safe")
-    p_status.set_defaults(func=cmd_status)
 
-    p_blogin = sub.add_parser("browser-login", help="Open browser and guide you to copy cookies")
-    p_blogin.set_defaults(func=cmd_browser_login)
+def _args_set_git_token(p):
+    p.add_argument("value", nargs="?", help="Token string")
 
-    p_blogin_qt = sub.add_parser("browser-login-qt", help="Use a Qt browser to login and auto-capture cookies (requires PySide6)")
-    p_blogin_qt.set_defaults(func=cmd_browser_login_qt)
 
-    p_sgt = sub.add_parser("set-git-token", help="Store Overleaf Git authentication token for cloning/pulling")
-    p_sgt.add_argument("value", nargs="?", help="Token string")
-    p_sgt.set_defaults(func=cmd_set_git_token)
+def _args_set_name_suffix(p):
+    p.add_argument("value", choices=["on", "off"])
 
-    p_cgt = sub.add_parser("clear-git-token", help="Clear stored Overleaf Git token")
-    p_cgt.set_defaults(func=cmd_clear_git_token)
 
-    p_ns = sub.add_parser("set-name-suffix", help="Toggle appending short project ID to folder names (on|off)")
-    p_ns.add_argument("value", choices=["on", "off"])
-    p_ns.set_defaults(func=cmd_set_name_suffix)
+# (name, help, handler, add_arguments); help=None keeps the command hidden.
+# Handlers import their heavy modules lazily, so listing them here costs nothing.
+COMMANDS = (
+    ("init", "First-run setup and optional scheduler install", cmd_init, _args_install),
+    ("install-scheduler", "Install background scheduler (LaunchAgent/systemd)", cmd_install, _args_install_scheduler),
+    ("uninstall-scheduler", "Uninstall background scheduler", cmd_uninstall, None),
+    ("run-once", "Run a single pull-only sync now (always full)", cmd_run_once, None),
+    # Hidden entry for scheduler dynamic mode
+    ("run-once-dynamic", None, cmd_run_once_dynamic, None),
+    ("sync", "Manual sync with optional overrides", cmd_sync, _args_sync),
+    ("set-interval", "Set sync interval (30m|1h|12h|24h)", cmd_set_interval, _args_set_interval),
+    ("set-count", "Set latest projects count", cmd_set_count, _args_set_count),
+    ("set-base-dir", "Set base directory for clones", cmd_set_base_dir, _args_set_base_dir),
+    ("set-cookie", "Store Overleaf cookies in config (paste or pass string)", cmd_set_cookie, _args_set_cookie),
+    ("clear-cookie", "Clear stored cookies from config", cmd_clear_cookie, None),
+    ("status", "Show current sync state; optional prune old projects", cmd_status, _args_status),
+    ("browser-login", "Open browser and guide you to copy cookies", cmd_browser_login, None),
+    ("browser-login-qt", "Use a Qt browser to login and auto-capture cookies (requires PySide6)", cmd_browser_login_qt, None),
+    ("set-git-token", "Store Overleaf Git authentication token for cloning/pulling", cmd_set_git_token, _args_set_git_token),
+    ("clear-git-token", "Clear stored Overleaf Git token", cmd_clear_git_token, None),
+    ("set-name-suffix", "Toggle appending short project ID to folder names (on|off)", cmd_set_name_suffix, _args_set_name_suffix),
+)
+
+
+def build_parser(only: str | None = None) -> argparse.ArgumentParser:
+    """Build the CLI parser; with only set, add just that subcommand."""
+    parser = argparse.ArgumentParser(prog="overleaf-pull", description="Pull-only Overleaf project sync")
+    sub = parser.add_subparsers(dest="cmd")
+    for name, help_text, handler, add_arguments in COMMANDS:
+        if only is not None and name != only:
+            continue
+        p = sub.add_parser(name, help=help_text) if help_text else sub.add_parser(name)
+        if add_arguments is not None:
+            add_arguments(p)
+        p.set_defaults(func=handler)
+    return parser
 
-    args = parser.parse_args()
+
+def main():
+    argv = sys.argv[1:]
+    # A known subcommand only needs its own subparser; --help, no args or an
+    # unknown command get the full parser for complete usage/error output
+    names = {c[0] for c in COMMANDS}
+    parser = build_parser(argv[0] if argv and argv[0] in names else None)
+    args = parser.parse_args(argv)
     if not hasattr(args, "func"):
         parser.print_help()
         sys.exit(1)
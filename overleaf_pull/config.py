@@ -1,12 +1,45 @@
+import contextlib
+import functools
 import json
 import os
 import platform
-import webbrowser
-from dataclasses import dataclass, asdict
-from typing import Optional, Tuple, Dict
+import tempfile
+import threading
+import typing
+from types import MappingProxyType
+from dataclasses import dataclass, asdict, replace
+from typing import Iterator, Optional, Tuple, Dict, TypedDict
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore
+
+# orjson (optional) is several times faster than json for the config/state files
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+_OS_NAME = platform.system()
+
+
+def _dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+def _loads(data: bytes):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 APP_NAME = "overleaf_pull"
 
+# Scheduler interval name -> seconds (read-only; unknown names fall back to 1h)
+INTERVAL_SECS = MappingProxyType({"30m": 1800, "1h": 3600, "12h": 43200, "24h": 86400})
+
 @dataclass
 class Config:
     base_dir: str
@@ -21,6 +54,7 @@ class Config:
     append_id_suffix: bool = True
     scheduler_mode: str = "dynamic"  # dynamic|full
     sync_on_plugged_in: bool = True  # Only run full sync when plugged in (laptop battery-aware)
+    jobs: int = 8  # Max projects synced concurrently
 
 
 def _mac_paths() -> Tuple[str, str, str]:
@@ -42,79 +76,181 @@ def _linux_paths() -> Tuple[str, str, str]:
     return support, logs, caches
 
 
+@functools.cache
 def get_app_paths() -> Tuple[str, str, str]:
-    if platform.system() == "Darwin":
+    """Return (support, logs, caches) dirs; computed once per process."""
+    if _OS_NAME == "Darwin":
         return _mac_paths()
     return _linux_paths()
 
 
+# Directories this process has already created; makedirs runs once per dir
+_MADE_DIRS: set = set()
+
+
+def _ensure_dir(path: str) -> str:
+    if path not in _MADE_DIRS:
+        os.makedirs(path, exist_ok=True)
+        _MADE_DIRS.add(path)
+    return path
+
+
 def get_config_path() -> str:
     support, _, _ = get_app_paths()
-    os.makedirs(support, exist_ok=True)
-    return os.path.join(support, "config.json")
+    return os.path.join(_ensure_dir(support), "config.json")
 
 
 def get_logs_dir() -> str:
     _, logs, _ = get_app_paths()
-    os.makedirs(logs, exist_ok=True)
-    return logs
+    return _ensure_dir(logs)
+
+
+# (path, handle) for app.log, opened once per process and shared by all writers
+_APP_LOG = None
+_APP_LOG_LOCK = threading.Lock()
+
+
+def append_app_log(line: str) -> None:
+    """Append one line to app.log (best effort; errors are ignored).
+
+    The file stays open for the process; each write holds an flock so lines from
+    concurrent scheduler/manual runs do not interleave.
+    """
+    global _APP_LOG
+    try:
+        with _APP_LOG_LOCK:
+            path = os.path.join(get_logs_dir(), "app.log")
+            if _APP_LOG is None or _APP_LOG[0] != path or _APP_LOG[1].closed:
+                _APP_LOG = (path, open(path, "a", encoding="utf-8"))
+            lf = _APP_LOG[1]
+            if fcntl is not None:
+                fcntl.flock(lf, fcntl.LOCK_EX)
+            try:
+                lf.write(line + "\n")
+                lf.flush()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lf, fcntl.LOCK_UN)
+    except Exception:
+        pass
 
 
 def get_cache_dir() -> str:
     _, _, caches = get_app_paths()
-    os.makedirs(caches, exist_ok=True)
-    return caches
+    return _ensure_dir(caches)
 
 
 def get_state_path() -> str:
     """Return path to the dynamic scheduling state file (JSON)."""
     support, _, _ = get_app_paths()
-    os.makedirs(support, exist_ok=True)
-    return os.path.join(support, "schedule_state.json")
+    return os.path.join(_ensure_dir(support), "schedule_state.json")
+
+
+class ProjectState(TypedDict, total=False):
+    """One schedule-state entry (state["projects"][project_id]), stored as a plain dict."""
+
+    name: str
+    folder: str
+    interval_sec: int
+    next_due_ts: int
+    default_branch: str
+    remote_fingerprint: str
+    last_updated_seen: str
+    consecutive_failures: int
+    pending_delete: bool
+    unsynced: bool
+
+
+# Last serialized state per path (as loaded or saved), so unchanged state is not rewritten
+_STATE_SNAPSHOT: Dict[str, bytes] = {}
 
 
 def load_schedule_state() -> dict:
     """Load the dynamic scheduling state JSON. Returns an object with keys:
     - version: int
-    - projects: { project_id: { name, folder, interval_sec, next_due_ts } }
+    - projects: { project_id: ProjectState }
     """
     path = get_state_path()
     if not os.path.exists(path):
         return {"version": 1, "projects": {}}
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(path, "rb") as f:
+            data = _loads(f.read())
         if not isinstance(data, dict):
             return {"version": 1, "projects": {}}
         data.setdefault("version", 1)
         data.setdefault("projects", {})
+        _STATE_SNAPSHOT[path] = _dumps(data)
         return data
     except Exception:
         return {"version": 1, "projects": {}}
 
 
+def atomic_write(path: str, data: str | bytes, mode: int = 0o600) -> None:
+    """Write data (str is UTF-8 encoded) to path atomically: unique temp file in the
+    same dir, fsync, rename. Concurrent writers never share a temp file, readers
+    never see a partial file, and the temp file is removed if anything fails."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    base, ext = os.path.splitext(os.path.basename(path))
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f".{base}.", suffix=ext)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if mode != 0o600:
+            # mkstemp always creates 0600
+            os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
+
+
 def save_schedule_state(state: dict) -> None:
-    """Persist dynamic scheduling state JSON to disk."""
+    """Persist dynamic scheduling state JSON to disk.
+
+    Skips the write when the state equals what was last loaded or saved; otherwise
+    writes it atomically (see atomic_write).
+    """
     path = get_state_path()
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(state, f, indent=2)
+        text = _dumps(state)
+        if _STATE_SNAPSHOT.get(path) == text and os.path.exists(path):
+            return
+        atomic_write(path, text)
+        _STATE_SNAPSHOT[path] = text
     except Exception:
         # Non-fatal; ignore write errors for now
         pass
 
 
-def load_config() -> Optional[Config]:
-    cfg_path = get_config_path()
-    if not os.path.exists(cfg_path):
-        return None
-    with open(cfg_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+@functools.lru_cache(maxsize=4)
+def _load_config_cached(cfg_path: str, mtime_ns: int) -> Config:
+    # mtime_ns is part of the cache key so external edits are picked up
+    with open(cfg_path, "rb") as f:
+        data = _loads(f.read())
     # Apply migrations for older configs
     data = _migrate_config(data)
     return Config(**data)
 
 
+def load_config() -> Optional[Config]:
+    """Load config.json; repeated calls reuse the parsed file until it changes.
+
+    Each call returns a fresh copy, so callers may modify it freely.
+    """
+    cfg_path = get_config_path()
+    try:
+        mtime_ns = os.stat(cfg_path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    cfg = _load_config_cached(cfg_path, mtime_ns)
+    return replace(cfg, cookies=dict(cfg.cookies) if cfg.cookies is not None else None)
+
+
 def _migrate_config(data: dict) -> dict:
     """Migrate older config formats to current version."""
     # For older configs without sync_on_plugged_in, default to True (battery-aware)
@@ -124,19 +260,87 @@ def _migrate_config(data: dict) -> dict:
 
 
 def save_config(cfg: Config) -> None:
-    cfg_path = get_config_path()
-    with open(cfg_path, "w", encoding="utf-8") as f:
-        json.dump(asdict(cfg), f, indent=2)
+    """Write config.json atomically (temp file in the same dir, fsync, rename).
+
+    The file is created mode 0600 since it may hold cookies and the Git token.
+    """
+    atomic_write(get_config_path(), _dumps(asdict(cfg)))
+    # mtime may not change on coarse-grained filesystems; drop the cache outright
+    _load_config_cached.cache_clear()
+
+
+def get_config() -> Config:
+    """Return the config, running first-time setup if there is none yet.
+
+    Parsing happens once per process (see load_config); each caller still gets
+    its own copy, and edits made by other processes are picked up.
+    """
+    return load_config() or prompt_first_run()
+
+
+@contextlib.contextmanager
+def editing_config() -> Iterator[Config]:
+    """Load the config (running first-time setup if needed), yield it for edits,
+    and save it once when the block exits without an error."""
+    cfg = get_config()
+    yield cfg
+    save_config(cfg)
 
 
 def default_base_dir() -> str:
     home = os.path.expanduser("~")
-    if platform.system() == "Darwin":
+    if _OS_NAME == "Darwin":
         return os.path.join(home, "Documents", "Overleaf")
     # Linux default
     return os.path.join(home, "Overleaf")
 
 
+def _matches_type(value, tp) -> bool:
+    """Whether a JSON value fits a Config annotation (str, int, bool, Optional[...], Dict[str, str])."""
+    origin = typing.get_origin(tp)
+    if origin is typing.Union:
+        return any(_matches_type(value, arg) for arg in typing.get_args(tp))
+    if origin is dict:
+        key_tp, value_tp = typing.get_args(tp)
+        return isinstance(value, dict) and all(
+            _matches_type(k, key_tp) and _matches_type(v, value_tp) for k, v in value.items()
+        )
+    if tp is type(None):
+        return value is None
+    if tp is int:
+        # bool is an int subclass, but true/false is not a count
+        return isinstance(value, int) and not isinstance(value, bool)
+    return isinstance(value, tp)
+
+
+def config_from_json(blob: str) -> Config:
+    """Non-interactive first run: build and save a Config from one JSON object.
+
+    Keys are Config's field names and values must match the field types (ValueError
+    otherwise); base_dir defaults as in the interactive setup and other missing
+    fields take their Config defaults.
+    """
+    data = _loads(blob)
+    if not isinstance(data, dict):
+        raise ValueError("Config JSON must be an object")
+    unknown = set(data) - set(Config.__dataclass_fields__)
+    if unknown:
+        raise ValueError(f"Unknown config field(s): {', '.join(sorted(unknown))}")
+    if data.get("base_dir") is None:
+        # null base_dir means "use the default", as when it is left out
+        data.pop("base_dir", None)
+    hints = typing.get_type_hints(Config)
+    for name, value in data.items():
+        if not _matches_type(value, hints[name]):
+            raise ValueError(f"Invalid value for config field {name!r}: {value!r}")
+    data["base_dir"] = os.path.expanduser(data.get("base_dir") or default_base_dir())
+    cfg = Config(**_migrate_config(data))
+    os.makedirs(cfg.base_dir, exist_ok=True)
+    save_config(cfg)
+    print(f"Saved config to {get_config_path()}")
+    return cfg
+
+
 def prompt_first_run() -> Config:
     print("First-time setup for Overleaf Sync")
     # Base directory
@@ -161,7 +365,7 @@ def prompt_first_run() -> Config:
         count = 10
 
     # Browser default
-    browser_default = "safari" if platform.system() == "Darwin" else "firefox"
+    browser_default = "safari" if _OS_NAME == "Darwin" else "firefox"
     browser_in = input(f"Browser to read Overleaf cookies from [safari|firefox] (default {browser_default}): ").strip().lower()
     if browser_in not in ("safari", "firefox", ""):
         browser = browser_default
@@ -199,6 +403,8 @@ def prompt_first_run() -> Config:
     open_help = input("Open Overleaf in your browser to fetch the token now? [Y/n]: ").strip().lower()
     if open_help != "n":
         try:
+            import webbrowser
+
             webbrowser.open(f"https://{host}/project")
         except Exception:
             pass
@@ -1,25 +1,40 @@
-import os
-import shutil
-import tempfile
-from typing import Dict, List
-
-try:
-    import browsercookie  # type: ignore
-except Exception:  # pragma: no cover
-    browsercookie = None
+import functools
+import time
+from typing import Dict, List, Optional, Tuple
 
 OVERLEAF_DOMAINS = ["overleaf.com", ".overleaf.com", "www.overleaf.com"]
+# Browser cookies per (browser, profile) -> (monotonic load time, jar)
+_COOKIE_CACHE: Dict[Tuple[str, Optional[str]], Tuple[float, Dict[str, str]]] = {}
+COOKIE_CACHE_TTL = 600
+
+
+def _is_overleaf_domain(domain: str) -> bool:
+    # overleaf.com or a subdomain (leading dot allowed); not look-alikes such as evil-overleaf.com
+    d = domain.lstrip(".").lower()
+    return d == "overleaf.com" or d.endswith(".overleaf.com")
+
+
+@functools.cache
+def _get_browsercookie():
+    # Imported on first Firefox read only: set-cookie, status with stored cookies
+    # and Safari users never load it
+    try:
+        import browsercookie  # type: ignore
+    except Exception:
+        return None
+    return browsercookie
 
 
 def _to_cookie_dict(cookies: List[dict]) -> Dict[str, str]:
     jar: Dict[str, str] = {}
     for c in cookies:
-        name = c.get("name") or c.get("Name")
-        value = c.get("value") or c.get("Value")
-        domain = c.get("domain") or c.get("Domain")
-        if not name or value is None:
+        get = c.get
+        domain = get("domain") or get("Domain")
+        if domain and not _is_overleaf_domain(domain):
             continue
-        if domain and not any(d in domain for d in OVERLEAF_DOMAINS):
+        name = get("name") or get("Name")
+        value = get("value") or get("Value")
+        if not name or value is None:
             continue
         jar[name] = value
     return jar
@@ -31,16 +46,17 @@ def parse_cookie_string(s: str) -> Dict[str, str]:
     Accepts optional leading 'Cookie:' and trims whitespace.
     """
     s = s.strip()
-    if s.lower().startswith("cookie:"):
-        s = s.split(":", 1)[1].strip()
-    jar: Dict[str, str] = {}
-    parts = [p.strip() for p in s.split(";") if p.strip()]
-    for part in parts:
-        if "=" not in part:
-            continue
-        name, value = part.split("=", 1)
-        jar[name.strip()] = value.strip()
-    return jar
+    # Lower only the 7-char prefix, not the whole (possibly multi-KB) header
+    if s[:7].lower() == "cookie:":
+        s = s[7:].lstrip()
+    # Parts without '=' (including empty ones) are skipped; partition keeps any
+    # '=' inside the value
+    return {
+        name.strip(): value.strip()
+        for part in s.split(";")
+        if "=" in part
+        for name, _, value in (part.partition("="),)
+    }
 
 
 def load_overleaf_cookies(browser: str, profile: str | None = None) -> Dict[str, str]:
@@ -54,15 +70,43 @@ def load_overleaf_cookies(browser: str, profile: str | None = None) -> Dict[str,
             "Safari cookie access is not supported without Qt. Please run 'overleaf-pull browser-login-qt' or paste cookies via 'overleaf-pull set-cookie'."
         )
     elif browser == "firefox":
+        browsercookie = _get_browsercookie()
         if browsercookie is None:
             raise RuntimeError("Firefox cookie access requires the 'browsercookie' package.")
         cj = browsercookie.firefox()
         jar: Dict[str, str] = {}
         for c in cj:
             domain = getattr(c, "domain", None)
-            if domain and not any(d in domain for d in OVERLEAF_DOMAINS):
+            if domain and not _is_overleaf_domain(domain):
                 continue
             jar[c.name] = c.value
         return jar
     else:
         raise ValueError("Unsupported browser; choose 'firefox' or use Qt login.")
+
+
+def load_overleaf_cookies_cached(browser: str, profile: str | None = None) -> Dict[str, str]:
+    """load_overleaf_cookies, reusing the result for COOKIE_CACHE_TTL seconds.
+
+    Cleared by invalidate_cookie_cache (e.g. when Overleaf rejects the session).
+    """
+    key = (browser, profile)
+    hit = _COOKIE_CACHE.get(key)
+    now = time.monotonic()
+    if hit is not None and now - hit[0] < COOKIE_CACHE_TTL:
+        return dict(hit[1])
+    jar = load_overleaf_cookies(browser, profile)
+    _COOKIE_CACHE[key] = (now, jar)
+    return dict(jar)
+
+
+def cookies_for_config(cfg) -> Dict[str, str]:
+    """Cookies for cfg: the ones stored in config, else the browser's (cached).
+
+    Stored cookies are the fast path: no browser cookie store is opened.
+    """
+    return cfg.cookies or load_overleaf_cookies_cached(cfg.browser, cfg.profile)
+
+
+def invalidate_cookie_cache() -> None:
+    _COOKIE_CACHE.clear()
@@ -1,7 +1,15 @@
+import asyncio
 import os
 import subprocess
+import threading
 from typing import Optional
 
+# Optional libgit2 bindings: ls-remote in-process instead of spawning git
+try:
+    import pygit2  # type: ignore
+except Exception:  # pragma: no cover
+    pygit2 = None  # type: ignore
+
 REMOTE_NAME = "origin"
 LEGACY_REMOTE_NAME = "overleaf"
 REMOTE_URL_FMT = "https://git.overleaf.com/{id}"
@@ -13,38 +21,117 @@ def build_remote_url(project_id: str, token: Optional[str] = None) -> str:
     return REMOTE_URL_FMT.format(id=project_id)
 
 
+# Projects sync on worker threads; one lock keeps their console lines whole
+_OUTPUT_LOCK = threading.Lock()
+
+
+def _echo(line: str) -> None:
+    with _OUTPUT_LOCK:
+        print(line, flush=True)
+
+
 def _git_env() -> dict:
     env = os.environ.copy()
     env.setdefault("GIT_TERMINAL_PROMPT", "0")
+    # Ask for protocol v2 (server-side ref filtering for ls-remote/fetch) even on
+    # git versions before 2.26 where it is not the default; appended after any
+    # GIT_CONFIG_* entries already set in the environment
+    try:
+        n = int(env.get("GIT_CONFIG_COUNT") or 0)
+    except ValueError:
+        return env
+    env["GIT_CONFIG_COUNT"] = str(n + 1)
+    env[f"GIT_CONFIG_KEY_{n}"] = "protocol.version"
+    env[f"GIT_CONFIG_VALUE_{n}"] = "2"
     return env
 
 
+def _in_repo(cmd: list[str], cwd: Optional[str]) -> tuple[list[str], Optional[str]]:
+    """Return (argv, cwd) to spawn; git changes directory itself (git -C) rather than
+    the child before exec. Other commands keep their cwd."""
+    if cwd and cmd[:1] == ["git"]:
+        return ["git", "-C", cwd, *cmd[1:]], None
+    return cmd, cwd
+
+
+def _decoded(name: str) -> property:
+    def get(self):
+        value = self.__dict__[name]
+        if isinstance(value, bytes):
+            value = self.__dict__[name] = value.decode("utf-8", "replace")
+        return value
+
+    def set(self, value):
+        self.__dict__[name] = value
+
+    return property(get, set)
+
+
+class _GitResult(subprocess.CompletedProcess):
+    """CompletedProcess whose stdout/stderr are captured as bytes and decoded (UTF-8)
+    on first access, so callers that only check returncode never decode."""
+
+    stdout = _decoded("stdout")
+    stderr = _decoded("stderr")
+
+
 def _run(cmd: list[str], cwd: Optional[str] = None) -> subprocess.CompletedProcess:
-    return subprocess.run(cmd, cwd=cwd, check=False, capture_output=True, text=True, env=_git_env())
+    argv, cwd = _in_repo(cmd, cwd)
+    res = subprocess.run(argv, cwd=cwd, check=False, capture_output=True, env=_git_env())
+    return _GitResult(argv, res.returncode, res.stdout, res.stderr)
+
+
+_STREAM_CHUNK = 64 * 1024
 
 
 def _run_stream(cmd: list[str], cwd: Optional[str] = None, mask_token: Optional[str] = None) -> tuple[int, str]:
     """Run a command and stream combined stdout/stderr live to the console.
 
     Returns (returncode, combined_output). Masks token occurrences in output if provided.
+    Output is read in binary chunks and echoed one batch of complete lines at a time.
     """
+    argv, cwd = _in_repo(cmd, cwd)
     proc = subprocess.Popen(
-        cmd,
+        argv,
         cwd=cwd,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
-        text=True,
         env=_git_env(),
-        bufsize=1,
     )
+    token = mask_token.encode("utf-8") if mask_token else None
     combined: list[str] = []
-    if proc.stdout is not None:
-        for line in proc.stdout:
-            s = line.rstrip("\n")
-            if mask_token:
-                s = s.replace(mask_token, "***")
-            print(s)
-            combined.append(s)
+
+    def _emit(raw_lines: list[bytes]) -> None:
+        lines = []
+        for raw in raw_lines:
+            # Mask on whole lines so a token can't be split across two chunks
+            raw = raw.rstrip(b"\r\n")
+            if token:
+                raw = raw.replace(token, b"***")
+            lines.append(raw.decode("utf-8", "replace"))
+        _echo("\n".join(lines))
+        combined.extend(lines)
+
+    try:
+        with proc.stdout:
+            pending = b""
+            while True:
+                chunk = proc.stdout.read1(_STREAM_CHUNK)
+                if not chunk:
+                    break
+                # \n, \r\n and bare \r (git progress) all end a line, as in text mode
+                lines = (pending + chunk).splitlines(keepends=True)
+                # An unterminated tail, or a lone \r that may be half of \r\n, waits for more
+                pending = lines.pop() if not lines[-1].endswith(b"\n") else b""
+                if lines:
+                    _emit(lines)
+            if pending:
+                _emit([pending])
+    except BaseException:
+        # Do not leave the child running (or unreaped) if reading or echoing failed
+        proc.kill()
+        proc.wait()
+        raise
     rc = proc.wait()
     return rc, "\n".join(combined)
 
@@ -56,33 +143,51 @@ def repo_exists(path: str) -> bool:
 def clone_if_missing(base_dir: str, folder: str, project_id: str, token: Optional[str] = None) -> str:
     path = os.path.join(base_dir, folder)
     if not repo_exists(path):
-        url = build_remote_url(project_id, token)
-        safe_url = url
-        if token:
-            safe_url = url.replace(token, "***")
-        print(f"$ git clone {safe_url} {path}")
-        rc, combined = _run_stream(["git", "clone", url, path], mask_token=token)
-        if rc != 0:
-            error_msg = combined.splitlines()[-1] if combined else 'unknown error'
-            
-            # Check if this is a token/authentication error
-            if _is_token_error(combined):
-                raise RuntimeError(
-                    f"GIT CLONE FAILED - AUTHENTICATION ERROR\n\n"
-                    f"Error: {error_msg}\n\n"
-                    "Your Overleaf Git authentication token is OUTDATED or INVALID.\n\n"
-                    "The token MUST be set using the set-git-token command:\n"
-                    "1. Get a new token from Overleaf account settings (https://www.overleaf.com/user/settings/tokens)\n"
-                    "2. Run: overleaf-pull set-git-token\n"
-                    "3. Enter the new token when prompted\n"
-                    "4. The new token will be used for all future clones"
-                )
-            
-            raise RuntimeError(f"git clone failed: {error_msg}")
+        clone_repo(path, project_id, token)
     return path
 
 
+def clone_repo(path: str, project_id: str, token: Optional[str] = None, partial: bool = False) -> None:
+    """Clone the Overleaf project into path (callers have already checked it is missing).
+
+    Overleaf projects have a single branch and no tags, so only the default branch
+    is cloned and tags are skipped. partial=True additionally makes a blob-less
+    partial clone: full history and a complete checkout, but old file versions are
+    only downloaded on demand. Servers without filter support ignore the option
+    and send a full clone.
+    """
+    url = build_remote_url(project_id, token)
+    safe_url = url
+    if token:
+        safe_url = url.replace(token, "***")
+    opts = ["--single-branch", "--no-tags"]
+    if partial:
+        opts.append("--filter=blob:none")
+    _echo(f"$ git clone {' '.join(opts + [safe_url, path])}")
+    rc, combined = _run_stream(["git", "clone", *opts, url, path], mask_token=token)
+    if rc != 0:
+        error_msg = combined.splitlines()[-1] if combined else 'unknown error'
+        
+        # Check if this is a token/authentication error
+        if _is_token_error(combined):
+            raise RuntimeError(
+                f"GIT CLONE FAILED - AUTHENTICATION ERROR\n\n"
+                f"Error: {error_msg}\n\n"
+                "Your Overleaf Git authentication token is OUTDATED or INVALID.\n\n"
+                "The token MUST be set using the set-git-token command:\n"
+                "1. Get a new token from Overleaf account settings (https://www.overleaf.com/user/settings/tokens)\n"
+                "2. Run: overleaf-pull set-git-token\n"
+                "3. Enter the new token when prompted\n"
+                "4. The new token will be used for all future clones"
+            )
+        
+        raise RuntimeError(f"git clone failed: {error_msg}")
+
+
 def ensure_remote(path: str, project_id: str, token: Optional[str] = None) -> None:
+    # Common case: .git/config already has the right URL and no legacy remote
+    if remote_url_matches(path, project_id, token):
+        return
     # If token is provided, ensure remote URL includes it; if not, avoid overriding
     target_url = build_remote_url(project_id, token) if token else None
     res = _run(["git", "remote", "get-url", REMOTE_NAME], cwd=path)
@@ -91,7 +196,7 @@ def ensure_remote(path: str, project_id: str, token: Optional[str] = None) -> No
             safe_url = target_url
             if token:
                 safe_url = target_url.replace(token, "***")
-            print(f"$ git remote add {REMOTE_NAME} {safe_url}")
+            _echo(f"$ git remote add {REMOTE_NAME} {safe_url}")
             _run(["git", "remote", "add", REMOTE_NAME, target_url], cwd=path)
             remove_legacy_remote(path)
         return
@@ -100,7 +205,7 @@ def ensure_remote(path: str, project_id: str, token: Optional[str] = None) -> No
         safe_url = target_url
         if token:
             safe_url = target_url.replace(token, "***")
-        print(f"$ git remote set-url {REMOTE_NAME} {safe_url}")
+        _echo(f"$ git remote set-url {REMOTE_NAME} {safe_url}")
         _run(["git", "remote", "set-url", REMOTE_NAME, target_url], cwd=path)
     remove_legacy_remote(path)
 
@@ -108,10 +213,71 @@ def ensure_remote(path: str, project_id: str, token: Optional[str] = None) -> No
 def remove_legacy_remote(path: str) -> None:
     res = _run(["git", "remote", "get-url", LEGACY_REMOTE_NAME], cwd=path)
     if res.returncode == 0:
-        print(f"$ git remote remove {LEGACY_REMOTE_NAME}")
+        _echo(f"$ git remote remove {LEGACY_REMOTE_NAME}")
         _run(["git", "remote", "remove", LEGACY_REMOTE_NAME], cwd=path)
 
 
+def _read_git_config(path: str) -> Optional[dict[str, str]]:
+    """Flatten path/.git/config to {"section.sub.key": value}, or None if it can't be read simply.
+
+    Section and key names are lowercased as git does. Only handles the plain layout
+    git itself writes; anything unusual (include directives, quoted or escaped
+    values, .git files from worktrees) returns None so callers fall back to git.
+    """
+    try:
+        with open(os.path.join(path, ".git", "config"), "r", encoding="utf-8") as f:
+            text = f.read()
+    except OSError:
+        return None
+    values: dict[str, str] = {}
+    section = None
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line or line[0] in "#;":
+            continue
+        if line[0] == "[":
+            kind, _, sub = line[1:line.find("]")].strip().partition(" ")
+            kind = kind.lower()
+            if kind in ("include", "includeif"):
+                return None
+            if sub[:1] == '"':
+                section = kind + "." + sub.strip('"')
+            else:
+                section = kind if not sub else None
+            continue
+        if section is None:
+            continue
+        key, sep, value = line.partition("=")
+        if sep:
+            value = value.strip()
+            if value[:1] == '"' or "\\" in value:
+                return None
+            values[f"{section}.{key.strip().lower()}"] = value
+    return values
+
+
+def _read_remote_urls(path: str) -> Optional[dict]:
+    """Map remote name -> url from path/.git/config, or None if it can't be read simply."""
+    values = _read_git_config(path)
+    if values is None:
+        return None
+    return {k[len("remote."):-len(".url")]: v for k, v in values.items() if k.startswith("remote.") and k.endswith(".url")}
+
+
+def remote_url_matches(path: str, project_id: str, token: Optional[str] = None) -> bool:
+    """True if .git/config already has the remote ensure_remote would set (no git spawned).
+
+    False means "unknown or different": callers then fall back to ensure_remote.
+    """
+    urls = _read_remote_urls(path)
+    if urls is None or LEGACY_REMOTE_NAME in urls:
+        return False
+    current = urls.get(REMOTE_NAME)
+    if current is None:
+        return False
+    return not token or current == build_remote_url(project_id, token)
+
+
 def _is_token_error(output: str) -> bool:
     """Detect if output indicates a token/authentication error."""
     output_lower = output.lower()
@@ -144,24 +310,161 @@ def _is_token_error(output: str) -> bool:
     return False
 
 
+# Default branch per repo for this process, keyed by (abs path, .git/HEAD mtime)
+_DEFAULT_BRANCH_CACHE: dict[tuple[str, int], str] = {}
+
+
+def _branch_cache_key(path: str) -> Optional[tuple[str, int]]:
+    try:
+        return (os.path.abspath(path), os.stat(os.path.join(path, ".git", "HEAD")).st_mtime_ns)
+    except OSError:
+        return None
+
+
+# Detected branch is stored in the repo's own config so later runs skip ls-remote
+_BRANCH_CONFIG_KEY = "overleaf.defaultbranch"
+
+
 def detect_default_branch(path: str) -> str:
-    # Try remote heads (quiet)
-    res = _run(["git", "ls-remote", "--heads", REMOTE_NAME], cwd=path)
-    heads = res.stdout.splitlines()
-    for line in heads:
-        if line.endswith("refs/heads/master"):
-            return "master"
-    for line in heads:
-        if line.endswith("refs/heads/main"):
-            return "main"
+    key = _branch_cache_key(path)
+    if key is not None and key in _DEFAULT_BRANCH_CACHE:
+        return _DEFAULT_BRANCH_CACHE[key]
+    branch = (_read_git_config(path) or {}).get(_BRANCH_CONFIG_KEY)
+    if not branch:
+        branch = _detect_default_branch(path)
+    if key is not None:
+        _DEFAULT_BRANCH_CACHE[key] = branch
+    return branch
+
+
+def _detect_default_branch(path: str) -> str:
+    # Try remote heads (quiet); shared with the later head check
+    heads = _remote_heads(path) or {}
+    for branch in ("master", "main"):
+        if f"refs/heads/{branch}" in heads:
+            # Only a remote answer is persisted; the local fallback below may be a guess
+            _run(["git", "config", "--local", "overleaf.defaultBranch", branch], cwd=path)
+            return branch
     # Fallback to local current
     res2 = _run(["git", "rev-parse", "--abbrev-ref", "HEAD"], cwd=path)
     return res2.stdout.strip() or "master"
 
 
+def _parse_ref_lines(output: str, prefix: str = "refs/heads/") -> dict[str, str]:
+    """Parse '<sha><sep><ref>' lines (ls-remote/for-each-ref) into {branch: sha}."""
+    heads: dict[str, str] = {}
+    for line in (output or "").splitlines():
+        parts = line.split(None, 1)
+        if len(parts) != 2:
+            continue
+        sha, ref = parts
+        if ref.startswith(prefix):
+            heads[ref[len(prefix):]] = sha
+    return heads
+
+
+_LS_REMOTE_HEADS_CMD = ["git", "ls-remote", "--heads", REMOTE_NAME]
+# %(HEAD) marks the checked-out branch with '*'
+_LOCAL_HEADS_CMD = ["git", "for-each-ref", "--format=%(objectname) %(refname) %(HEAD)", "refs/heads/"]
+
+
+def _resolve_heads(
+    branch: Optional[str], ls_res: subprocess.CompletedProcess, loc_res: subprocess.CompletedProcess
+) -> tuple[str, Optional[str], Optional[str]]:
+    remote = _parse_ref_lines(ls_res.stdout) if ls_res.returncode == 0 else {}
+    local: dict[str, str] = {}
+    current = None
+    if loc_res.returncode == 0:
+        for line in loc_res.stdout.splitlines():
+            parts = line.split()
+            if len(parts) < 2 or not parts[1].startswith("refs/heads/"):
+                continue
+            name = parts[1][len("refs/heads/"):]
+            local[name] = parts[0]
+            if len(parts) > 2 and parts[2] == "*":
+                current = name
+    if branch is None:
+        if "master" in remote:
+            branch = "master"
+        elif "main" in remote:
+            branch = "main"
+        else:
+            branch = current or "master"
+    return branch, local.get(branch), remote.get(branch)
+
+
+def batch_heads(path: str, branch: Optional[str] = None) -> tuple[str, Optional[str], Optional[str]]:
+    """Return (branch, local_head, remote_head) using one ls-remote and one for-each-ref.
+
+    If branch is None, the default branch is picked from the same ls-remote output
+    (master, then main), falling back to the locally checked-out branch.
+    """
+    branch, lhead, rhead = _resolve_heads(
+        branch, _run(_LS_REMOTE_HEADS_CMD, cwd=path), _run(_LOCAL_HEADS_CMD, cwd=path)
+    )
+    if lhead is None:
+        # Same fallback as get_local_branch_head: use HEAD if branch missing
+        res = _run(["git", "rev-parse", "HEAD"], cwd=path)
+        if res.returncode == 0:
+            lhead = (res.stdout or "").strip() or None
+    return branch, lhead, rhead
+
+
+async def _run_async(cmd: list[str], cwd: Optional[str] = None) -> subprocess.CompletedProcess:
+    """asyncio counterpart of _run (captured, decoded output; never raises on exit code)."""
+    argv, cwd = _in_repo(cmd, cwd)
+    proc = await asyncio.create_subprocess_exec(
+        *argv,
+        cwd=cwd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=_git_env(),
+    )
+    out, err = await proc.communicate()
+    return _GitResult(argv, proc.returncode, out, err)
+
+
+async def ensure_remote_async(path: str, project_id: str, token: Optional[str] = None) -> None:
+    """Check remotes from .git/config, else with one async `git config` call; fall back
+    to ensure_remote (in a worker thread) to fix them."""
+    if remote_url_matches(path, project_id, token):
+        return
+    res = await _run_async(["git", "config", "--get-regexp", r"^remote\..*\.url$"], cwd=path)
+    urls = {}
+    for line in res.stdout.splitlines():
+        key, _, url = line.partition(" ")
+        urls[key] = url.strip()
+    target_url = build_remote_url(project_id, token) if token else None
+    current = urls.get(f"remote.{REMOTE_NAME}.url")
+    origin_ok = current is not None and (target_url is None or current == target_url)
+    if origin_ok and f"remote.{LEGACY_REMOTE_NAME}.url" not in urls:
+        return
+    # ensure_remote spawns blocking git commands; keep them off the event loop
+    await asyncio.to_thread(ensure_remote, path, project_id, token)
+
+
+async def batch_heads_async(path: str, branch: Optional[str] = None) -> tuple[str, Optional[str], Optional[str]]:
+    """asyncio variant of batch_heads; ls-remote and for-each-ref run concurrently."""
+    ls_res, loc_res = await asyncio.gather(
+        _run_async(_LS_REMOTE_HEADS_CMD, cwd=path), _run_async(_LOCAL_HEADS_CMD, cwd=path)
+    )
+    branch, lhead, rhead = _resolve_heads(branch, ls_res, loc_res)
+    if lhead is None:
+        res = await _run_async(["git", "rev-parse", "HEAD"], cwd=path)
+        if res.returncode == 0:
+            lhead = (res.stdout or "").strip() or None
+    return branch, lhead, rhead
+
+
+class RemoteBranchMissingError(RuntimeError):
+    """git pull failed because the branch no longer exists on the remote."""
+
+
 def pull_remote(path: str, branch: str) -> None:
-    print(f"$ git pull {REMOTE_NAME} {branch}")
-    rc, combined = _run_stream(["git", "pull", REMOTE_NAME, branch], cwd=path)
+    # Overleaf repos have no tags; --no-tags also covers clones made before
+    # clone_repo set tagOpt
+    _echo(f"$ git pull --no-tags {REMOTE_NAME} {branch}")
+    rc, combined = _run_stream(["git", "pull", "--no-tags", REMOTE_NAME, branch], cwd=path)
     if rc != 0:
         error_msg = combined.splitlines()[-1] if combined else 'unknown error'
         
@@ -178,24 +481,95 @@ def pull_remote(path: str, branch: str) -> None:
                 "4. The new token will be used for all future pulls"
             )
         
+        if "couldn't find remote ref" in combined.lower():
+            # Stored default branch is gone on the remote; detect it again next time
+            _run(["git", "config", "--local", "--unset", "overleaf.defaultBranch"], cwd=path)
+            _DEFAULT_BRANCH_CACHE.clear()
+            # Callers holding the branch elsewhere (schedule state) must drop it too
+            raise RemoteBranchMissingError(f"git pull failed: {error_msg}")
         raise RuntimeError(f"git pull failed: {error_msg}")
 
 
+def _remote_heads_pygit2(path: str) -> Optional[dict[str, str]]:
+    """Return {ref: sha} for origin via pygit2, or None if unavailable/failed."""
+    if pygit2 is None:
+        return None
+    try:
+        remote = pygit2.Repository(path).remotes[REMOTE_NAME]
+        return {r["name"]: str(r["oid"]) for r in remote.ls_remotes()}
+    except Exception:
+        return None
+
+
+# Successful ls-remote results per repo path; failures are not stored
+_REMOTE_HEADS_CACHE: dict[str, dict[str, str]] = {}
+
+
+def _remote_heads(path: str) -> Optional[dict[str, str]]:
+    """{ref: sha} for origin's branches from one ls-remote (or pygit2); None on failure.
+
+    Memoized per path, so branch detection and head checks share a single server
+    round trip; sync runs call clear_remote_heads_cache() on start so each run
+    sees fresh remote state. A failure is retried on the next call rather than
+    cached, so one network error does not hide the remote.
+    """
+    heads = _REMOTE_HEADS_CACHE.get(path)
+    if heads is not None:
+        return heads
+    heads = _remote_heads_pygit2(path)
+    if heads is None:
+        res = _run(_LS_REMOTE_HEADS_CMD, cwd=path)
+        if res.returncode != 0:
+            return None
+        heads = _parse_ref_lines(res.stdout, prefix="")
+    _REMOTE_HEADS_CACHE[path] = heads
+    return heads
+
+
+def clear_remote_heads_cache() -> None:
+    _REMOTE_HEADS_CACHE.clear()
+
+
 def get_remote_branch_head(path: str, branch: str) -> Optional[str]:
-    """Return the remote branch head commit SHA for the given branch, or None if not found (quiet)."""
-    ref = f"refs/heads/{branch}"
-    res = _run(["git", "ls-remote", REMOTE_NAME, ref], cwd=path)
-    if res.returncode != 0:
+    """Return the remote branch head commit SHA for the given branch, or None if not found (quiet).
+
+    Uses pygit2 when installed (no git subprocess); otherwise git ls-remote.
+    """
+    heads = _remote_heads(path)
+    if not heads:
         return None
-    line = (res.stdout or "").strip()
-    if not line:
+    return heads.get(f"refs/heads/{branch}") or None
+
+
+def _fast_local_head(path: str, branch: str) -> Optional[str]:
+    """Read refs/heads/<branch> straight from .git (loose ref, then packed-refs); None if absent."""
+    git_dir = os.path.join(path, ".git")
+    try:
+        with open(os.path.join(git_dir, "refs", "heads", branch), "r", encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        pass
+    except OSError:
         return None
-    sha = line.split("\t")[0]
-    return sha or None
+    ref = f"refs/heads/{branch}"
+    try:
+        with open(os.path.join(git_dir, "packed-refs"), "r", encoding="utf-8") as f:
+            for line in f:
+                if line[:1] in ("#", "^"):
+                    continue
+                sha, _, name = line.rstrip("\n").partition(" ")
+                if name == ref:
+                    return sha or None
+    except OSError:
+        pass
+    return None
 
 
 def get_local_branch_head(path: str, branch: str) -> Optional[str]:
     """Return the local branch head commit SHA, or HEAD if branch missing."""
+    sha = _fast_local_head(path, branch)
+    if sha:
+        return sha
     res = _run(["git", "rev-parse", f"refs/heads/{branch}"], cwd=path)
     if res.returncode == 0:
         return (res.stdout or "").strip() or None
@@ -234,6 +608,37 @@ def has_unpushed_commits(path: str, branch: str) -> Optional[bool]:
     return cnt > 0
 
 
+def inspect_worktree(path: str) -> tuple[bool, Optional[bool], Optional[str]]:
+    """Return (clean, ahead, branch) for a prune decision, mostly from one git process.
+
+    Uses 'git status --porcelain=v2 --branch': cleanliness and, when HEAD tracks
+    origin/<branch>, the ahead count come from the same output. ahead/branch are
+    None for dirty repos (never deleted, so not needed); without usable tracking
+    info this falls back to detect_default_branch + has_unpushed_commits.
+    """
+    res = _run(["git", "status", "--porcelain=v2", "--branch"], cwd=path)
+    if res.returncode != 0:
+        return False, None, None
+    head = upstream = ahead = None
+    for line in res.stdout.splitlines():
+        if not line.startswith("# "):
+            return False, None, None
+        name, _, value = line[2:].partition(" ")
+        if name == "branch.head":
+            head = value
+        elif name == "branch.upstream":
+            upstream = value
+        elif name == "branch.ab":
+            try:
+                ahead = int(value.split()[0].lstrip("+"))
+            except (IndexError, ValueError):
+                ahead = None
+    if head and head != "(detached)" and upstream == f"{REMOTE_NAME}/{head}" and ahead is not None:
+        return True, ahead > 0, head
+    branch = detect_default_branch(path)
+    return True, has_unpushed_commits(path, branch), branch
+
+
 def enable_git_helper(os_name: str) -> None:
     if os_name == "Darwin":
         _run(["git", "config", "--global", "credential.helper", "osxkeychain"]) 
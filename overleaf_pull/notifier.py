@@ -4,7 +4,7 @@ import time
 from datetime import datetime
 from typing import Optional
 
-from .config import get_logs_dir
+from .config import append_app_log
 
 try:
     from desktop_notifier import DesktopNotifier
@@ -26,15 +26,6 @@ def _now_stamp() -> str:
     return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
 
-def _append_app_log(line: str) -> None:
-    try:
-        logs_dir = get_logs_dir()
-        with open(f"{logs_dir}/app.log", "a", encoding="utf-8") as lf:
-            lf.write(line + "\n")
-    except Exception:
-        pass
-
-
 def _throttled(key: str, cooldown_sec: int = 900) -> bool:
     now = time.time()
     last = _LAST_SENT.get(key, 0.0)
@@ -229,7 +220,7 @@ def report_sync_failure(
     if context:
         log_line += f" | {context}"
     log_line += f" | {details_text}"
-    _append_app_log(log_line)
+    append_app_log(log_line)
     if cli:
         try:
             details = details_text
@@ -1,6 +1,22 @@
+import sys
+
 LOGIN_URL = "https://www.overleaf.com/login"
 PROJECT_URL = "https://www.overleaf.com/project"
 
+# Off-the-record WebEngine profile shared by all logins in this process
+_PROFILE = None
+
+
+def _get_profile(app):
+    global _PROFILE
+    from PySide6.QtWebEngineCore import QWebEngineProfile, QWebEngineSettings
+
+    if _PROFILE is None:
+        _PROFILE = QWebEngineProfile(app)
+        _PROFILE.setPersistentCookiesPolicy(QWebEngineProfile.NoPersistentCookies)
+        _PROFILE.settings().setAttribute(QWebEngineSettings.JavascriptEnabled, True)
+    return _PROFILE
+
 
 def login_via_qt():
     """Open a Qt WebEngine browser to login and capture cookies + CSRF.
@@ -12,25 +28,28 @@ def login_via_qt():
         from PySide6.QtCore import QUrl, QCoreApplication
         from PySide6.QtWidgets import QApplication, QMainWindow
         from PySide6.QtWebEngineWidgets import QWebEngineView
-        from PySide6.QtWebEngineCore import QWebEngineProfile, QWebEngineSettings, QWebEnginePage
+        from PySide6.QtWebEngineCore import QWebEnginePage
     except Exception as e:
         raise RuntimeError(
             "PySide6 (Qt WebEngine) is required for this command. Install with 'conda install -c conda-forge pyside6' or 'pip install PySide6'."
         ) from e
 
+    # Reuse the running QApplication (and its WebEngine setup) on repeated logins
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+
     class _Window(QMainWindow):
-        def __init__(self):
+        def __init__(self, profile):
             super().__init__()
             self.webview = QWebEngineView()
             self._cookies = {}
             self._csrf = ""
             self._done = False
 
-            self.profile = QWebEngineProfile(self.webview)
+            self.profile = profile
             self.cookie_store = self.profile.cookieStore()
             self.cookie_store.cookieAdded.connect(self._on_cookie_added)
-            self.profile.setPersistentCookiesPolicy(QWebEngineProfile.NoPersistentCookies)
-            self.profile.settings().setAttribute(QWebEngineSettings.JavascriptEnabled, True)
+            # Replay cookies kept from an earlier login in this process
+            self.cookie_store.loadAllCookies()
 
             webpage = QWebEnginePage(self.profile, self)
             self.webview.setPage(webpage)
@@ -61,10 +80,11 @@ def login_via_qt():
                 """
                 self.webview.page().runJavaScript(js, 0, _cb)
 
-    app = QApplication([])
-    win = _Window()
+    win = _Window(_get_profile(app))
     win.show()
     app.exec()
+    win.cookie_store.cookieAdded.disconnect(win._on_cookie_added)
+    win.close()
 
     if not win._done:
         return None
@@ -1,4 +1,6 @@
-from typing import List, Dict, Any
+import hashlib
+import heapq
+from typing import List, Dict, Any, Tuple
 
 # Attempt to import PyOverleaf Api with flexibility (module paths may vary)
 try:
@@ -9,6 +11,9 @@ except Exception:  # pragma: no cover
     except Exception:
         Api = None  # type: ignore
 
+# Logged-in Api instances, keyed by (host, cookie hash); reused within one process
+_API_CACHE: Dict[Tuple[str, str], Any] = {}
+
 
 def create_api(host: str = "www.overleaf.com"):
     if Api is None:
@@ -16,23 +21,75 @@ def create_api(host: str = "www.overleaf.com"):
     return Api(host=host)
 
 
+def _cookie_key(cookies: Dict[str, str]) -> str:
+    return hashlib.sha1(repr(sorted(cookies.items())).encode("utf-8")).hexdigest()
+
+
+def create_api_cached(host: str, cookies: Dict[str, str]):
+    """Return an Api for host already logged in with cookies, reusing a cached instance.
+
+    Repeated calls with the same host and cookies skip Api construction and login.
+    """
+    key = (host, _cookie_key(cookies))
+    api = _API_CACHE.get(key)
+    if api is None:
+        api = create_api(host)
+        api.login_from_cookies(cookies)
+        api._overleaf_pull_cookie_key = key[1]
+        _API_CACHE[key] = api
+    return api
+
+
+def invalidate_api_cache(host: str | None = None) -> None:
+    """Drop cached Api instances (all, or only those for host)."""
+    for key in list(_API_CACHE):
+        if host is None or key[0] == host:
+            _API_CACHE.pop(key, None)
+
+
+def _is_unauthorized(exc: Exception) -> bool:
+    response = getattr(exc, "response", None)
+    return getattr(response, "status_code", None) in (401, 403)
+
+
+def _field(p, *names):
+    # p may be a dict or an object (PyOverleaf Project); support both
+    for n in names:
+        v = p.get(n) if isinstance(p, dict) else getattr(p, n, None)
+        if v:
+            return v
+    return None
+
+
+def _normalize(p) -> Tuple[Any, Any, Any]:
+    # PyOverleaf's Project exposes last_updated; raw API dicts use lastUpdated
+    return (_field(p, "lastUpdated", "last_updated"), _field(p, "id"), _field(p, "name"))
+
+
+def _sort_key(t: Tuple[Any, Any, Any]):
+    # Projects without a timestamp sort last
+    return (t[0] is not None, t[0] or 0)
+
+
 def list_projects_sorted_by_last_updated(api, cookies: Dict[str, str], limit: int) -> List[Dict[str, Any]]:
-    """Login with cookies and list projects, sorted by lastUpdated descending, limited to 'limit'."""
-    api.login_from_cookies(cookies)
-    projects = api.get_projects()
-    # Each project likely has attributes: id, name, lastUpdated
-    def last_updated(p):
-        # p may be a dict or an object; support both
-        v = getattr(p, "lastUpdated", None)
-        if v is None:
-            v = p.get("lastUpdated") if isinstance(p, dict) else None
-        return v or 0
-
-    projects_sorted = sorted(projects, key=last_updated, reverse=True)
-    result: List[Dict[str, Any]] = []
-    for p in projects_sorted[:limit]:
-        pid = getattr(p, "id", None) or (p.get("id") if isinstance(p, dict) else None)
-        name = getattr(p, "name", None) or (p.get("name") if isinstance(p, dict) else None)
-        lu = getattr(p, "lastUpdated", None) or (p.get("lastUpdated") if isinstance(p, dict) else None)
-        result.append({"id": pid, "name": name, "lastUpdated": lu})
-    return result
+    """Login with cookies and list projects, sorted by lastUpdated descending, limited to 'limit'.
+
+    Login is skipped when api came from create_api_cached with the same cookies.
+    """
+    if getattr(api, "_overleaf_pull_cookie_key", None) != _cookie_key(cookies):
+        api.login_from_cookies(cookies)
+    try:
+        projects = api.get_projects()
+    except Exception as e:
+        if _is_unauthorized(e):
+            # Session rejected; make sure the next call starts from a fresh login
+            # with freshly read browser cookies
+            from .cookies import invalidate_cookie_cache
+
+            invalidate_api_cache()
+            invalidate_cookie_cache()
+        raise
+    # Normalize each project once to (lastUpdated, id, name); select the newest
+    # `limit` in O(N log limit) (nlargest keeps sorted()'s order for ties)
+    top = heapq.nlargest(limit, map(_normalize, projects), key=_sort_key)
+    return [{"id": pid, "name": name, "lastUpdated": lu} for lu, pid, name in top]
@@ -1,14 +1,29 @@
+import functools
 import os
 import re
+import string
 from typing import Dict
 
 SAFE_CHARS = re.compile(r"[^A-Za-z0-9._-]+")
 
+# ASCII fast path for SAFE_CHARS: unsafe characters become NUL, and runs of NUL are
+# joined with a single '-' afterwards, matching SAFE_CHARS.sub("-", ...).
+_SAFE = set(string.ascii_letters + string.digits + "._-")
+_ASCII_UNSAFE = str.maketrans({chr(i): "\0" for i in range(128) if chr(i) not in _SAFE})
 
+
+def _sanitize(project_name: str) -> str:
+    if project_name.isascii():
+        parts = project_name.translate(_ASCII_UNSAFE).split("\0")
+        return "-".join(p for p in parts if p)
+    return SAFE_CHARS.sub("-", project_name)
+
+
+@functools.lru_cache(maxsize=512)
 def folder_name_for(project_name: str | None, project_id: str) -> str:
     if not project_name:
         return project_id
-    base = SAFE_CHARS.sub("-", project_name).strip("-._")
+    base = _sanitize(project_name).strip("-._")
     suffix = project_id[:8] if project_id else ""
     name = f"{base}-{suffix}" if suffix else base
     return name or (project_id or "overleaf-project")
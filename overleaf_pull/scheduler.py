@@ -1,8 +1,9 @@
 import os
-import platform
+import string
 import subprocess
 import sys
-from .config import get_app_paths, get_config_path
+from types import MappingProxyType
+from .config import INTERVAL_SECS, atomic_write, get_app_paths, get_config_path
 
 LAUNCHAGENTS_DIR = os.path.expanduser("~/Library/LaunchAgents")
 SYSTEMD_USER_DIR = os.path.expanduser("~/.config/systemd/user")
@@ -12,6 +13,55 @@ PLIST_LABEL = "com.overleaf.pull"
 SERVICE_NAME = "overleaf-pull.service"
 TIMER_NAME = "overleaf-pull.timer"
 
+# systemd OnCalendar expression per interval; anything else runs daily
+_ON_CALENDAR = MappingProxyType({"30m": "*-*-* *:00,30:00", "1h": "hourly", "12h": "*-*-* 00,12:00:00"})
+
+# Unit file templates, parsed once at import; only the install-specific values are filled in
+PLIST_TEMPLATE = string.Template("""
+<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE plist PUBLIC "-//Apple//DTD PLIST 1.0//EN" "http://www.apple.com/DTDs/PropertyList-1.0.dtd">
+<plist version="1.0">
+  <dict>
+    <key>Label</key>
+    <string>$label</string>
+    <key>ProgramArguments</key>
+    <array>
+$program_arguments
+    </array>
+    <key>RunAtLoad</key>
+    <true/>
+    <key>StartInterval</key>
+    <integer>$start_interval</integer>
+    <key>StandardOutPath</key>
+    <string>$stdout</string>
+    <key>StandardErrorPath</key>
+    <string>$stderr</string>
+  </dict>
+</plist>
+""")
+
+SERVICE_TEMPLATE = string.Template("""
+[Unit]
+Description=Overleaf Sync pull-only job
+
+[Service]
+Type=oneshot
+ExecStart=$exec_start
+""")
+
+TIMER_TEMPLATE = string.Template("""
+[Unit]
+Description=Run Overleaf Sync periodically ($interval)
+
+[Timer]
+OnCalendar=$on_calendar
+Persistent=true
+RandomizedDelaySec=300
+
+[Install]
+WantedBy=timers.target
+""")
+
 
 def _run(cmd: list[str]) -> subprocess.CompletedProcess:
     return subprocess.run(cmd, check=False, capture_output=True, text=True)
@@ -66,42 +116,31 @@ def _quote_for_systemd(arg: str) -> str:
     return arg
 
 
+def _plist_content(args: list[str], interval: str, logs_dir: str) -> str:
+    """LaunchAgent plist running args every interval, logging into logs_dir."""
+    return PLIST_TEMPLATE.substitute(
+        label=PLIST_LABEL,
+        program_arguments="\n".join(f"\t\t<string>{a}</string>" for a in args),
+        start_interval=INTERVAL_SECS.get(interval, 3600),
+        stdout=os.path.join(logs_dir, "runner.log"),
+        stderr=os.path.join(logs_dir, "runner.err.log"),
+    )
+
+
+def _systemd_units(args: list[str], interval: str) -> tuple[str, str]:
+    """(service, timer) unit file contents running args every interval."""
+    service = SERVICE_TEMPLATE.substitute(exec_start=" ".join(_quote_for_systemd(a) for a in args))
+    timer = TIMER_TEMPLATE.substitute(interval=interval, on_calendar=_ON_CALENDAR.get(interval, "daily"))
+    return service, timer
+
+
 def install_macos_launchagent(interval: str, mode: str = "dynamic"):
     os.makedirs(LAUNCHAGENTS_DIR, exist_ok=True)
-    start_interval = {"30m": 1800, "1h": 3600, "12h": 43200, "24h": 86400}.get(interval, 3600)
     support, logs_dir, _ = get_app_paths()
     os.makedirs(logs_dir, exist_ok=True)
-    stdout = os.path.join(logs_dir, "runner.log")
-    stderr = os.path.join(logs_dir, "runner.err.log")
-
-    args = _cli_entry(mode)
-    program_arguments_xml = "\n".join([f"\t\t<string>{a}</string>" for a in args])
-
-    plist = f"""
-<?xml version="1.0" encoding="UTF-8"?>
-<!DOCTYPE plist PUBLIC "-//Apple//DTD PLIST 1.0//EN" "http://www.apple.com/DTDs/PropertyList-1.0.dtd">
-<plist version="1.0">
-  <dict>
-    <key>Label</key>
-    <string>{PLIST_LABEL}</string>
-    <key>ProgramArguments</key>
-    <array>
-{program_arguments_xml}
-    </array>
-    <key>RunAtLoad</key>
-    <true/>
-    <key>StartInterval</key>
-    <integer>{start_interval}</integer>
-    <key>StandardOutPath</key>
-    <string>{stdout}</string>
-    <key>StandardErrorPath</key>
-    <string>{stderr}</string>
-  </dict>
-</plist>
-"""
+    plist = _plist_content(_cli_entry(mode), interval, logs_dir)
     plist_path = os.path.join(LAUNCHAGENTS_DIR, f"{PLIST_LABEL}.plist")
-    with open(plist_path, "w", encoding="utf-8") as f:
-        f.write(plist)
+    atomic_write(plist_path, plist, mode=0o644)
     # Unload any existing agent under the new label, and also attempt to remove the legacy label
     _run(["launchctl", "unload", "-w", plist_path])
     legacy_plist = os.path.join(LAUNCHAGENTS_DIR, "com.overleaf.sync.plist")
@@ -131,42 +170,11 @@ def uninstall_macos_launchagent():
 
 def install_systemd_user(interval: str, mode: str = "dynamic"):
     os.makedirs(SYSTEMD_USER_DIR, exist_ok=True)
-    args = " ".join(_quote_for_systemd(a) for a in _cli_entry(mode))
-    service = f"""
-[Unit]
-Description=Overleaf Sync pull-only job
-
-[Service]
-Type=oneshot
-ExecStart={args}
-"""
-    if interval == "30m":
-        on_calendar = "*-*-* *:00,30:00"
-    elif interval == "1h":
-        on_calendar = "hourly"
-    elif interval == "12h":
-        on_calendar = "*-*-* 00,12:00:00"
-    else:
-        on_calendar = "daily"
-
-    timer = f"""
-[Unit]
-Description=Run Overleaf Sync periodically ({interval})
-
-[Timer]
-OnCalendar={on_calendar}
-Persistent=true
-RandomizedDelaySec=300
-
-[Install]
-WantedBy=timers.target
-"""
+    service, timer = _systemd_units(_cli_entry(mode), interval)
     service_path = os.path.join(SYSTEMD_USER_DIR, SERVICE_NAME)
     timer_path = os.path.join(SYSTEMD_USER_DIR, TIMER_NAME)
-    with open(service_path, "w", encoding="utf-8") as f:
-        f.write(service)
-    with open(timer_path, "w", encoding="utf-8") as f:
-        f.write(timer)
+    atomic_write(service_path, service, mode=0o644)
+    atomic_write(timer_path, timer, mode=0o644)
 
     _run(["systemctl", "--user", "daemon-reload"])
     # Disable legacy timer if it exists
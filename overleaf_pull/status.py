@@ -1,25 +1,58 @@
+import asyncio
 import sys
 import os
 import concurrent.futures
+import datetime
+import time
 
-from .config import load_config, prompt_first_run, get_logs_dir
+from .config import INTERVAL_SECS, get_config, get_logs_dir
 from .notifier import report_sync_failure
 
 
+_MAX_CONCURRENT_CHECKS = 32
+_TAIL_BLOCK = 8 * 1024
+_TAIL_MAX_WINDOW = 1024 * 1024
+
+
 def _tail(path: str, lines: int = 50) -> list[str]:
+    """Return the last `lines` lines of path, reading backwards from the end in blocks
+    until enough newlines are seen (at most _TAIL_MAX_WINDOW bytes)."""
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            content = f.readlines()
+        with open(path, "rb") as f:
+            pos = os.fstat(f.fileno()).st_size
+            chunks: list[bytes] = []
+            newlines = 0
+            read = 0
+            # lines + 1 newlines guarantee `lines` complete lines even with a trailing newline
+            while pos > 0 and newlines <= lines and read < _TAIL_MAX_WINDOW:
+                size = min(_TAIL_BLOCK, pos)
+                pos -= size
+                f.seek(pos)
+                block = f.read(size)
+                chunks.append(block)
+                newlines += block.count(b"\n")
+                read += size
+        content = b"".join(reversed(chunks)).decode("utf-8", "replace").splitlines()
+        if pos > 0:
+            # First line is likely cut off mid-way
+            content = content[1:]
         return content[-lines:]
     except Exception:
         return []
 
 
+def _iso_from_ts(ts: float) -> str:
+    try:
+        return datetime.datetime.fromtimestamp(ts).isoformat(timespec="seconds")
+    except Exception:
+        return str(ts)
+
+
 def _log_ts(line: str):
     try:
         start = line.index("[") + 1
         end = line.index("]", start)
-        return __import__("datetime").datetime.fromisoformat(line[start:end])
+        return datetime.datetime.fromisoformat(line[start:end])
     except Exception:
         return None
 
@@ -32,32 +65,74 @@ def _success_clears_error(last_success_ts, error_ts) -> bool:
     return bool(last_success_ts and error_ts and last_success_ts >= error_ts)
 
 
+def _is_app_error_line(line: str) -> bool:
+    if "status list projects" in line.lower():
+        return False
+    if line.startswith("[") and ("Overleaf Sync:" in line or "Runner skipped" in line):
+        return "Failed" in line or "Failure" in line or "ERROR" in line or "Error" in line
+    return False
+
+
+def _scan_app_log(path: str) -> dict:
+    """Walk the tail of app.log once from the end, collecting the newest
+    offline skip (last 50 lines only), successful sync, and sync error lines.
+    """
+    found: dict = {}
+    lines = _tail(path, 200)
+    offline_floor = len(lines) - 50
+    for i in range(len(lines) - 1, -1, -1):
+        line = lines[i].strip()
+        if not line:
+            continue
+        if "offline_msg" not in found and i >= offline_floor and "] Runner skipped (no internet)" in line:
+            found["offline_msg"] = line
+        if "last_success" not in found and _is_success_line(line):
+            found["last_success"] = line
+        if "error_msg" not in found and _is_app_error_line(line):
+            found["error_msg"] = line
+        if len(found) == 3 or (i < offline_floor and "last_success" in found and "error_msg" in found):
+            break
+    return found
+
+
+def _last_match(path: str, predicate, lines: int = 200):
+    """Return the newest non-empty (stripped) line in the tail of path matching predicate, or None."""
+    for line in reversed(_tail(path, lines)):
+        s = line.strip()
+        if s and predicate(s):
+            return s
+    return None
+
+
+def _is_runner_error_line(line: str) -> bool:
+    return "Traceback" in line or "Error" in line or "Exception" in line
+
+
+def _scan_runner_err(path: str):
+    """Return the newest error-looking line from runner.err.log, or None."""
+    return _last_match(path, _is_runner_error_line)
+
+
 def cmd_status(args):
     # Sync health check: verify local repos match remote heads
-    cfg = load_config() or prompt_first_run()
+    cfg = get_config()
     if not cfg.git_token:
         print("Git token missing. Run 'overleaf-pull set-git-token'.")
         return
     # Gather projects
-    cookies = cfg.cookies if cfg.cookies else None
-    if not cookies:
-        from .cookies import load_overleaf_cookies
-        cookies = load_overleaf_cookies(cfg.browser, cfg.profile)
+    from .cookies import cookies_for_config
+
+    cookies = cookies_for_config(cfg)
     try:
-        from .overleaf_api import create_api, list_projects_sorted_by_last_updated
-        api = create_api(cfg.host)
+        from .overleaf_api import create_api_cached, list_projects_sorted_by_last_updated
+        api = create_api_cached(cfg.host, cookies)
         projects = list_projects_sorted_by_last_updated(api, cookies, cfg.count)
     except Exception as e:
         report_sync_failure(e, context="status list projects", cli=True, desktop=False)
         sys.exit(1)
 
     from .projects import folder_name_for
-    from .git_ops import (
-        ensure_remote,
-        detect_default_branch,
-        get_remote_branch_head,
-        get_local_branch_head,
-    )
+    from .git_ops import ensure_remote_async, detect_default_branch, batch_heads_async
 
     total = len(projects)
     if total == 0:
@@ -65,20 +140,37 @@ def cmd_status(args):
         return
     print(f"Checking status for {total} latest project(s)...", flush=True)
 
-    def _check(p: dict):
+    # Folder names for valid project ids, computed once for the checks and the old-repo scan
+    folders: dict[str, str] = {}
+    for p in projects:
+        pid = p.get("id")
+        if isinstance(pid, str) and pid:
+            folders[pid] = folder_name_for(p.get("name") or "", pid)
+    expected = set(folders.values())
+    # One scan of base_dir serves both the missing-repo checks and the old-repo scan
+    try:
+        with os.scandir(cfg.base_dir) as it:
+            existing = {e.name for e in it if e.is_dir()}
+    except FileNotFoundError:
+        existing = set()
+
+    # Git probes are pure subprocess I/O: drive them from one event loop, bounded
+    # so large accounts don't spawn hundreds of git processes at once.
+    async def _check(p: dict, sem: asyncio.Semaphore):
         pid = p.get("id")
         name = p.get("name") or ""
         if not isinstance(pid, str) or not pid:
             return ("outdated", f"Invalid project entry (missing id) for {name or '(unknown)'}")
-        folder = folder_name_for(name, pid)
+        folder = folders[pid]
+        if folder not in existing:
+            return ("missing", f"Missing: {name}")
         repo_path = os.path.join(cfg.base_dir, folder)
         if not os.path.isdir(os.path.join(repo_path, ".git")):
             return ("missing", f"Missing: {name}")
         try:
-            ensure_remote(repo_path, pid, cfg.git_token)
-            branch = detect_default_branch(repo_path)
-            rhead = get_remote_branch_head(repo_path, branch)
-            lhead = get_local_branch_head(repo_path, branch)
+            async with sem:
+                await ensure_remote_async(repo_path, pid, cfg.git_token)
+                _, lhead, rhead = await batch_heads_async(repo_path)
             if not rhead or not lhead:
                 return ("outdated", f"Outdated: {name} (unable to determine heads)")
             if rhead != lhead:
@@ -87,61 +179,58 @@ def cmd_status(args):
         except Exception as e:
             return ("outdated", f"Outdated: {name} (error: {e})")
 
+    async def _check_all():
+        sem = asyncio.Semaphore(_MAX_CONCURRENT_CHECKS)
+        return await asyncio.gather(*[_check(p, sem) for p in projects])
+
     up_to_date = 0
     missing = 0
     outdated = 0
     issues: list[str] = []
-    done = 0
-    max_workers = min(16, total)
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as ex:
-        futures = [ex.submit(_check, p) for p in projects]
-        for fut in concurrent.futures.as_completed(futures):
-            status, msg = fut.result()
-            done += 1
-            if status == "up":
-                up_to_date += 1
-            elif status == "missing":
-                missing += 1
-                if msg:
-                    issues.append(msg)
-            else:
-                outdated += 1
-                if msg:
-                    issues.append(msg)
+    for status, msg in asyncio.run(_check_all()):
+        if status == "up":
+            up_to_date += 1
+        elif status == "missing":
+            missing += 1
+            if msg:
+                issues.append(msg)
+        else:
+            outdated += 1
+            if msg:
+                issues.append(msg)
     print("\n=== Summary ===")
     print(
         f"- Up to date: {up_to_date}/{total} | Missing: {missing}/{total} | Outdated: {outdated}/{total}"
     )
 
     # Identify old projects (not in latest set)
-    expected = set()
-    for p in projects:
-        pid = p.get("id")
-        name = p.get("name") or ""
-        if isinstance(pid, str) and pid:
-            expected.add(folder_name_for(name, pid))
     old_repos = []
-    for entry in os.listdir(cfg.base_dir):
-        path = os.path.join(cfg.base_dir, entry)
-        if os.path.isdir(os.path.join(path, ".git")) and entry not in expected:
+    for name in sorted(existing - expected):
+        path = os.path.join(cfg.base_dir, name)
+        if os.path.isdir(os.path.join(path, ".git")):
             old_repos.append(path)
 
     # Report old local repos and their Git status (clean/dirty, unpushed commits)
     if old_repos:
-        from .git_ops import is_worktree_clean, has_unpushed_commits, detect_default_branch
+        from .git_ops import inspect_worktree, detect_default_branch
+        def _inspect(repo: str):
+            # -> (repo, branch, clean, ahead); None marks a check that failed
+            try:
+                clean, ahead, branch = inspect_worktree(repo)
+                return (repo, branch, clean, ahead)
+            except Exception:
+                return (repo, None, None, None)
+
         safe = []
         pending = []
-        for repo in old_repos[:200]:
-            try:
-                branch = detect_default_branch(repo)
-                clean = is_worktree_clean(repo)
-                ahead = has_unpushed_commits(repo, branch)
+        # Each repo costs a few git subprocesses; inspect them concurrently
+        checked = old_repos[:200]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(checked))) as ex:
+            for repo, branch, clean, ahead in ex.map(_inspect, checked):
                 if clean and ahead is False:
                     safe.append((repo, branch))
                 else:
                     pending.append((repo, branch, clean, ahead))
-            except Exception as e:
-                pending.append((repo, None, None, None))
 
         # Safe lingering repos: no action needed (list only)
         if safe:
@@ -176,19 +265,25 @@ def cmd_status(args):
     removed = []
     if args.prune and old_repos:
         import shutil
-        from .git_ops import is_worktree_clean, has_unpushed_commits
-        for repo in old_repos:
-            branch = detect_default_branch(repo)
-            clean = is_worktree_clean(repo)
-            ahead = has_unpushed_commits(repo, branch)
-            if clean and ahead is False:
-                try:
+        from .git_ops import inspect_worktree
+
+        def _prune_one(repo: str) -> bool:
+            try:
+                clean, ahead, _ = inspect_worktree(repo)
+                if clean and ahead is False:
                     shutil.rmtree(repo)
+                    return True
+            except Exception:
+                pass
+            return False
+
+        # Each repo is independent and rmtree is unlink-bound; prune them concurrently
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(old_repos))) as ex:
+            for repo, ok in zip(old_repos, ex.map(_prune_one, old_repos)):
+                if ok:
                     removed.append(repo)
-                except Exception:
+                else:
                     lingering.append(repo)
-            else:
-                lingering.append(repo)
 
     if removed:
         print(f"Pruned {len(removed)} old project(s).")
@@ -203,77 +298,41 @@ def cmd_status(args):
     app_log = os.path.join(logs_dir, "app.log")
     runner_log = os.path.join(logs_dir, "runner.log")
     runner_err = os.path.join(logs_dir, "runner.err.log")
-    has_runner_logs = (os.path.exists(runner_log) or os.path.exists(runner_err))
-    # Optional: show last background worker run time
-    last_run = None
+    # One directory scan instead of separate exists()/getmtime() calls per log
+    log_stats = {}
     try:
-        candidates = [p for p in (runner_log, runner_err) if os.path.exists(p)]
-        if candidates:
-            mtimes = [(p, os.path.getmtime(p)) for p in candidates]
-            last_run = max(mtimes, key=lambda x: x[1])[1]
-    except Exception:
-        last_run = None
+        with os.scandir(logs_dir) as it:
+            for e in it:
+                if e.name in ("app.log", "runner.log", "runner.err.log") and e.is_file():
+                    log_stats[e.name] = e.stat()
+    except OSError:
+        pass
+    has_app_log = "app.log" in log_stats
+    runner_mtimes = [log_stats[n].st_mtime for n in ("runner.log", "runner.err.log") if n in log_stats]
+    has_runner_logs = bool(runner_mtimes)
+    has_logs = has_runner_logs or has_app_log
+    # Optional: show last background worker run time
+    last_run = max(runner_mtimes) if runner_mtimes else None
     # Show scheduler configuration
     mode = getattr(cfg, "scheduler_mode", "dynamic")
     print(f"Scheduler: interval={cfg.sync_interval}, mode={mode}")
-    # Detect offline runner skip (from app.log)
-    offline_msg = None
-    offline_ts = None
-    if os.path.exists(app_log):
-        lines = _tail(app_log, 50)
-        for line in reversed(lines):
-            line = line.strip()
-            if "] Runner skipped (no internet)" in line:
-                offline_msg = line
-                offline_ts = _log_ts(line)
-                break
-
-    # Detect last successful sync message (from app.log)
-    last_success = None
-    last_success_ts = None
-    if os.path.exists(app_log):
-        lines = _tail(app_log, 200)
-        for line in reversed(lines):
-            line = line.strip()
-            if _is_success_line(line):
-                last_success = line
-                last_success_ts = _log_ts(line)
-                break
+    # Scan each log once (offline skip, last success, app-log error; runner.err errors)
+    app_scan = _scan_app_log(app_log) if has_app_log else {}
+    offline_msg = app_scan.get("offline_msg")
+    offline_ts = _log_ts(offline_msg) if offline_msg else None
+    last_success = app_scan.get("last_success")
+    last_success_ts = _log_ts(last_success) if last_success else None
 
     # Detect runner errors (prefer runner.err.log on macOS, fall back to app.log everywhere)
     error_msg = None
     error_ts = None
-    if os.path.exists(runner_err):
-        err_lines = _tail(runner_err, 200)
-        for line in reversed(err_lines):
-            s = line.strip()
-            if not s:
-                continue
-            if (
-                "Traceback" in s
-                or "Error" in s
-                or "Exception" in s
-                or "ModuleNotFoundError" in s
-            ):
-                error_msg = s
-                try:
-                    error_ts = __import__("datetime").datetime.fromtimestamp(os.path.getmtime(runner_err))
-                except Exception:
-                    error_ts = None
-                break
-    if error_msg is None and os.path.exists(app_log):
-        app_lines = _tail(app_log, 200)
-        for line in reversed(app_lines):
-            s = line.strip()
-            if not s:
-                continue
-            if "status list projects" in s.lower():
-                continue
-            if s.startswith("[") and ("Overleaf Sync:" in s or "Runner skipped" in s):
-                if "Failed" in s or "Failure" in s or "ERROR" in s or "Error" in s:
-                    error_msg = s
-                    error_ts = _log_ts(s)
-                    break
+    if "runner.err.log" in log_stats:
+        error_msg = _scan_runner_err(runner_err)
+        if error_msg:
+            error_ts = datetime.datetime.fromtimestamp(log_stats["runner.err.log"].st_mtime)
+    if error_msg is None:
+        error_msg = app_scan.get("error_msg")
+        error_ts = _log_ts(error_msg) if error_msg else None
 
     # A newer successful sync clears older runner/app-log errors for status display.
     if error_msg and _success_clears_error(last_success_ts, error_ts):
@@ -286,95 +345,70 @@ def cmd_status(args):
         if effective_last_run is None or success_epoch > effective_last_run:
             effective_last_run = success_epoch
     
+    last_activity_iso = _iso_from_ts(effective_last_run) if effective_last_run else None
+
     # Compute next worker run time (approximate)
+    next_run_ts = None
     next_run_str = None
     try:
-        interval_map = {"30m": 1800, "1h": 3600, "12h": 43200, "24h": 86400}
-        iv = interval_map.get(cfg.sync_interval, 3600)
+        iv = INTERVAL_SECS.get(cfg.sync_interval, 3600)
         if effective_last_run:
-            import datetime as _dt
-            nr = effective_last_run + iv
-            next_run_str = _dt.datetime.fromtimestamp(nr).isoformat(timespec='seconds')
+            next_run_ts = effective_last_run + iv
+            next_run_str = _iso_from_ts(next_run_ts)
     except Exception:
+        next_run_ts = None
         next_run_str = None
 
     # Determine staleness relative to interval
     is_stale = False
     try:
         if effective_last_run:
-            import time as _time
-            interval_map = {"30m": 1800, "1h": 3600, "12h": 43200, "24h": 86400}
-            iv = interval_map.get(cfg.sync_interval, 3600)
+            iv = INTERVAL_SECS.get(cfg.sync_interval, 3600)
             # Consider stale if last run is older than 1.5x interval
-            is_stale = (_time.time() - effective_last_run) > (iv * 1.5)
+            is_stale = (time.time() - effective_last_run) > (iv * 1.5)
     except Exception:
         is_stale = False
 
-    if error_msg and (has_runner_logs or os.path.exists(app_log)):
+    if error_msg and has_logs:
         print(f"Background runner ERROR. {error_msg}")
-        if effective_last_run:
-            try:
-                import datetime as _dt
-                ts = _dt.datetime.fromtimestamp(effective_last_run).isoformat(timespec='seconds')
-                print(f"Last sync activity: {ts}")
-            except Exception:
-                pass
+        if last_activity_iso:
+            print(f"Last sync activity: {last_activity_iso}")
         if next_run_str:
             print(f"Worker next run: {next_run_str} (approx)")
         print("Hint: reinstall the scheduler or fix Python environment for the runner.")
         if last_success:
             print(f"Last successful sync: {last_success}")
-    elif offline_msg and (has_runner_logs or os.path.exists(app_log)) and (
+    elif offline_msg and has_logs and (
         last_success_ts is None or offline_ts is None or offline_ts >= last_success_ts
     ):
         print(f"Background runner STALE (offline). {offline_msg}")
-        if effective_last_run:
-            try:
-                import datetime as _dt
-                ts = _dt.datetime.fromtimestamp(effective_last_run).isoformat(timespec='seconds')
-                print(f"Last sync activity: {ts}")
-            except Exception:
-                pass
+        if last_activity_iso:
+            print(f"Last sync activity: {last_activity_iso}")
         if next_run_str:
             print(f"Worker next run: {next_run_str} (approx)")
         if last_success:
             print(f"Last successful sync: {last_success}")
-    elif is_stale and (has_runner_logs or os.path.exists(app_log)):
+    elif is_stale and has_logs:
         print("Background runner STALE (missed schedule?).")
-        if effective_last_run:
-            try:
-                import datetime as _dt
-                ts = _dt.datetime.fromtimestamp(effective_last_run).isoformat(timespec='seconds')
-                print(f"Last sync activity: {ts}")
-            except Exception:
-                pass
+        if last_activity_iso:
+            print(f"Last sync activity: {last_activity_iso}")
         if next_run_str:
             print(f"Worker next run: {next_run_str} (approx)")
         if last_success:
             print(f"Last successful sync: {last_success}")
-    elif last_success and (has_runner_logs or os.path.exists(app_log)):
+    elif last_success and has_logs:
         print(f"Background runner OK. {last_success}")
-        if effective_last_run:
-            try:
-                import datetime as _dt
-                ts = _dt.datetime.fromtimestamp(effective_last_run).isoformat(timespec='seconds')
-                print(f"Last sync activity: {ts}")
-            except Exception:
-                pass
+        if last_activity_iso:
+            print(f"Last sync activity: {last_activity_iso}")
         if next_run_str:
             print(f"Worker next run: {next_run_str} (approx)")
     elif last_success:
         print(f"Manual sync OK. {last_success}")
     else:
-        if has_runner_logs or os.path.exists(app_log):
+        if has_logs:
             print("Background runner NOT SUCCESSFUL yet (no successful sync recorded).")
-            if effective_last_run:
-                try:
-                    import datetime as _dt
-                    ts = _dt.datetime.fromtimestamp(effective_last_run).isoformat(timespec='seconds')
-                    print(f"Last sync activity: {ts}")
-                except Exception:
-                    pass
+            if last_activity_iso:
+                print(f"Last sync activity: {last_activity_iso}")
             if next_run_str:
                 print(f"Worker next run: {next_run_str} (approx)")
             if last_success:
@@ -389,7 +423,6 @@ def cmd_status(args):
         projs = st.get("projects", {})
         if projs:
             print("\n=== Timers (next due) ===")
-            import time as _time
             items = []
             for pid, ent in projs.items():
                 nd = int(ent.get("next_due_ts", 0) or 0)
@@ -401,7 +434,7 @@ def cmd_status(args):
                 repo_exists = bool(repo_path and os.path.isdir(os.path.join(repo_path, ".git")))
                 items.append((nd, pid, ent.get("name") or pid, interval, pending, unsynced, repo_exists))
             items.sort(key=lambda x: x[0])
-            now_ts = int(_time.time())
+            now_ts = int(time.time())
 
             def _format_future(delta_sec: int) -> str:
                 mins = max(0, delta_sec // 60)
@@ -410,27 +443,17 @@ def cmd_status(args):
                 hrs = mins // 60
                 return f"in {hrs}h"
 
-            interval_map = {"30m": 1800, "1h": 3600, "12h": 43200, "24h": 86400}
-            scheduler_interval_sec = interval_map.get(cfg.sync_interval, 3600)
+            scheduler_interval_sec = INTERVAL_SECS.get(cfg.sync_interval, 3600)
             scheduler_eta_fallback = f"in about {_format_future(scheduler_interval_sec).removeprefix('in ')}"
 
             runner_eta_str = None
-            if next_run_str:
-                try:
-                    import datetime as _dt
-                    runner_eta_ts = int(_dt.datetime.fromisoformat(next_run_str).timestamp())
-                    runner_eta = max(0, runner_eta_ts - now_ts)
-                    runner_eta_str = _format_future(runner_eta)
-                except Exception:
-                    runner_eta_str = None
+            if next_run_ts:
+                runner_eta = max(0, int(next_run_ts) - now_ts)
+                runner_eta_str = _format_future(runner_eta)
 
             for nd, pid, nm, interval, pending, unsynced, repo_exists in items[:10]:
                 delta = nd - now_ts
-                try:
-                    import datetime as _dt
-                    ts = _dt.datetime.fromtimestamp(nd).isoformat(timespec='seconds')
-                except Exception:
-                    ts = str(nd)
+                ts = _iso_from_ts(nd) if delta > 0 else ""
                 if delta <= 0:
                     overdue = -delta
                     if overdue > interval:
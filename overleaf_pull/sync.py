@@ -2,42 +2,306 @@ import platform
 import os
 import socket
 import re
-from datetime import datetime
-from .config import load_config, prompt_first_run, Config, get_logs_dir, load_schedule_state, save_schedule_state
-from .cookies import load_overleaf_cookies
-from .overleaf_api import create_api, list_projects_sorted_by_last_updated
+import shutil
+import sys
+import threading
+import time
+import random
+import hashlib
+import concurrent.futures
+from typing import Optional
+from .config import get_config, Config, ProjectState, append_app_log, load_schedule_state, save_schedule_state
+from .cookies import cookies_for_config
+from .overleaf_api import create_api_cached, list_projects_sorted_by_last_updated
 from .projects import folder_name_for, ensure_dir
 from .notifier import report_sync_failure
 from .git_ops import (
-    clone_if_missing,
+    repo_exists,
+    clone_repo,
     ensure_remote,
     detect_default_branch,
     pull_remote,
+    RemoteBranchMissingError,
     enable_git_helper,
-    is_worktree_clean,
-    has_unpushed_commits,
+    inspect_worktree,
     get_remote_branch_head,
+    clear_remote_heads_cache,
     get_local_branch_head,
     build_remote_url,
 )
 
+# The OS cannot change while the process runs
+_OS_NAME = platform.system()
+
+
+try:
+    import psutil
+except Exception:  # pragma: no cover
+    psutil = None  # type: ignore
+
+# Power state is re-probed at most once per _POWER_CACHE_SEC
+_POWER_CACHE_SEC = 60
+_power_cache: Optional[tuple[float, bool]] = None
+
 
 def is_plugged_in() -> bool:
     """
     Detect if the system is plugged into power (not running on battery).
-    Works on macOS and Linux.
+    Works on macOS and Linux. The result is cached for _POWER_CACHE_SEC.
     
     Returns:
         bool: True if plugged in, False if on battery. Returns True if no battery detected (desktop).
     """
+    global _power_cache
+    now = time.monotonic()
+    if _power_cache is not None and now - _power_cache[0] < _POWER_CACHE_SEC:
+        return _power_cache[1]
     try:
-        import psutil
-        battery = psutil.sensors_battery()
-        if battery is None:
-            return True  # No battery detected (desktop)
-        return battery.power_plugged
+        battery = psutil.sensors_battery() if psutil is not None else None
+        # No battery detected (desktop) counts as plugged in
+        plugged = True if battery is None else bool(battery.power_plugged)
     except Exception:
-        return True  # Assume plugged in if detection fails
+        plugged = True  # Assume plugged in if detection fails
+    _power_cache = (now, plugged)
+    return plugged
+
+
+def _remote_fingerprint(pid: str, token: Optional[str]) -> str:
+    """Hash of what ensure_remote configures, so the token is never stored in state."""
+    return hashlib.sha1(f"{pid}:{token or ''}".encode("utf-8")).hexdigest()
+
+
+def _log_stamp() -> str:
+    # Same text as datetime.now().isoformat(timespec="seconds"), via the C formatter
+    return time.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def _sync_project(
+    cfg: Config, pid: str, folder: str, branch: Optional[str] = None, remote_ok: bool = False
+) -> tuple[bool, Optional[str], Optional[Exception], Optional[str]]:
+    """Ensure one project's repo is cloned/configured and pull it if the remote head moved.
+
+    branch is the default branch cached in schedule state (detected when None or
+    after a fresh clone); remote_ok skips ensure_remote when the stored remote
+    fingerprint still matches. Returns (pulled, failed_stage, error, branch); failed_stage
+    is "project" (clone/remote/head checks) or "pull". If the cached branch is gone
+    on the remote, the pull is retried once on the newly detected default branch.
+    Never raises, so it is safe to run in a worker thread.
+    """
+    try:
+        # Ensure repo exists (one .git check) and remote configured
+        repo_path = os.path.join(cfg.base_dir, folder)
+        if not repo_exists(repo_path):
+            clone_repo(repo_path, pid, cfg.git_token)
+            # Fresh clone: origin already has the target URL and the checkout is at
+            # the remote head, so skip ensure_remote, ls-remote and pull; detect the
+            # branch instead of trusting the cache
+            return False, None, None, detect_default_branch(repo_path)
+        if not remote_ok:
+            ensure_remote(repo_path, pid, cfg.git_token)
+        branch = branch or detect_default_branch(repo_path)
+
+        # Compare heads (one ls-remote, one local ref read) to decide whether to pull
+        rhead = get_remote_branch_head(repo_path, branch)
+        lhead = get_local_branch_head(repo_path, branch)
+        changed = (rhead != lhead) or (not rhead) or (not lhead)
+    except Exception as e:
+        return False, "project", e, None
+    if not changed:
+        return False, None, None, branch
+    try:
+        pull_remote(repo_path, branch)
+    except RemoteBranchMissingError as e:
+        # The cached default branch is gone on Overleaf; pull_remote dropped the stored
+        # one, so detect it again (from this run's ls-remote) and retry once
+        try:
+            fresh = detect_default_branch(repo_path)
+        except Exception:
+            return False, "pull", e, branch
+        if fresh == branch:
+            return False, "pull", e, branch
+        try:
+            pull_remote(repo_path, fresh)
+        except Exception as e2:
+            return False, "pull", e2, fresh
+        return True, None, None, fresh
+    except Exception as e:
+        return False, "pull", e, branch
+    return True, None, None, branch
+
+
+def _job_args(cfg: Config, pid: str, folder: str, entry: ProjectState) -> tuple:
+    """_sync_project arguments for pid from its cached schedule entry."""
+    remote_ok = entry.get("remote_fingerprint") == _remote_fingerprint(pid, cfg.git_token)
+    return folder, entry.get("default_branch"), remote_ok
+
+
+def _record_remote(cfg: Config, pid: str, entry: ProjectState, branch: str) -> None:
+    # Set once ensure_remote and branch detection succeeded for this project
+    entry["default_branch"] = branch
+    entry["remote_fingerprint"] = _remote_fingerprint(pid, cfg.git_token)
+
+
+def _forget_remote(entry: ProjectState) -> None:
+    # After a failed pull the cached branch (or remote) may be what broke it, e.g.
+    # the default branch changed on Overleaf; check both again on the next run
+    entry.pop("default_branch", None)
+    entry.pop("remote_fingerprint", None)
+
+
+def _unchanged_since_sync(repo_dir: str, entry: ProjectState, last_updated) -> bool:
+    """True if Overleaf reports the same lastUpdated as at the last successful sync
+    and the repo is still there, so clone, ls-remote and pull can all be skipped."""
+    return bool(last_updated) and entry.get("last_updated_seen") == str(last_updated) and repo_exists(repo_dir)
+
+
+def _record_seen(entry: ProjectState, last_updated) -> None:
+    # Only after a successful sync, so a failed pull is retried on the next run
+    if last_updated:
+        entry["last_updated_seen"] = str(last_updated)
+
+
+def _schedule_next(entry: ProjectState, interval: int, now: int) -> None:
+    """Set the entry's interval and next due time, with up to 25% random jitter
+    so projects that came due together do not stay in lockstep."""
+    entry["interval_sec"] = interval
+    entry["next_due_ts"] = now + interval + random.randint(0, interval // 4)
+
+
+def _failure_interval(entry: ProjectState, min_sec: int, max_sec: int) -> int:
+    """Count a failed attempt; retry after min_sec, doubling per consecutive failure up to max_sec."""
+    failures = int(entry.get("consecutive_failures", 0) or 0) + 1
+    entry["consecutive_failures"] = failures
+    return min(min_sec * 2 ** (failures - 1), max_sec)
+
+
+def _sync_projects(cfg: Config, todo: dict[str, tuple]):
+    """Run _sync_project for each {pid: (folder, cached_branch, remote_ok)} in a thread pool (cfg.jobs workers).
+
+    Yields (pid, pulled, failed_stage, error, branch) in completion order. Projects
+    are independent and git releases the GIL while waiting on the network.
+    """
+    if not todo:
+        return
+    jobs = max(1, min(int(getattr(cfg, "jobs", 8) or 1), len(todo)))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as ex:
+        futs = {ex.submit(_sync_project, cfg, pid, *args): pid for pid, args in todo.items()}
+        for fut in concurrent.futures.as_completed(futs):
+            yield (futs[fut], *fut.result())
+
+
+def _prune_check(path: str):
+    """Return (deletable, error): True if the repo at path is clean with no unpushed commits.
+
+    Runs in a worker thread, so it never touches state or deletes anything.
+    """
+    try:
+        clean, ahead, _ = inspect_worktree(path)
+        return clean and ahead is False, None
+    except Exception as e:
+        return False, e
+
+
+# Background deletion of pruned repos started by this process
+_PENDING_REMOVALS: list = []
+
+
+def _rmtree(path: str) -> bool:
+    """Remove the tree at path, logging each entry that could not be removed to app.log.
+
+    Returns False if anything was left behind.
+    """
+    failed = []
+
+    def _onexc(func, p, exc):
+        failed.append(p)
+        append_app_log(f"[{_log_stamp()}] Prune could not remove {p}: {exc}")
+
+    # onerror is deprecated from 3.12; onexc gets the exception instead of exc_info
+    if sys.version_info >= (3, 12):
+        shutil.rmtree(path, onexc=_onexc)
+    else:
+        shutil.rmtree(path, onerror=lambda func, p, exc_info: _onexc(func, p, exc_info[1]))
+    return not failed
+
+
+def _remove_repos_later(paths: list) -> None:
+    """Delete pruned repos on a non-daemon thread, so the run's summary is not held up
+    by unlinking; the interpreter waits for the thread before exiting. Several repos
+    are removed concurrently (up to 4 at a time), and a count of failed removals is
+    logged once all are done."""
+    if not paths:
+        return
+
+    def _worker():
+        if len(paths) == 1:
+            removed = [_rmtree(paths[0])]
+        else:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(4, len(paths))) as ex:
+                removed = list(ex.map(_rmtree, paths))
+        failed = removed.count(False)
+        if failed:
+            append_app_log(f"[{_log_stamp()}] Prune failed to remove {failed} of {len(paths)} old repo(s)")
+
+    t = threading.Thread(target=_worker, name="overleaf-pull-prune")
+    t.start()
+    _PENDING_REMOVALS.append(t)
+
+
+def _wait_for_pending_removals() -> None:
+    while _PENDING_REMOVALS:
+        _PENDING_REMOVALS.pop().join()
+
+
+def _prune_old_repos(cfg: Config, expected: set, proj_state: dict[str, ProjectState]) -> tuple[int, int, list]:
+    """Pick repos in base_dir to prune (folder not in expected, clean, nothing unpushed).
+
+    Returns (pruned, lingering, paths_to_remove); callers hand the paths to
+    _remove_repos_later once state is saved. Returns immediately when every directory
+    is expected. Otherwise the git checks run concurrently and schedule state is
+    updated from the calling thread.
+    """
+    # A previous run in this process may still be deleting repos
+    _wait_for_pending_removals()
+    # scandir's d_type avoids a stat per entry; only unexpected dirs get a .git check
+    with os.scandir(cfg.base_dir) as it:
+        old_dirs = [e.name for e in it if e.name not in expected and e.is_dir(follow_symlinks=False)]
+    old_dirs = [d for d in old_dirs if repo_exists(os.path.join(cfg.base_dir, d))]
+    if not old_dirs:
+        return 0, 0, []
+    pruned = 0
+    lingering = 0
+    to_remove = []
+    jobs = max(1, min(int(getattr(cfg, "jobs", 8) or 1), len(old_dirs)))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as ex:
+        results = list(ex.map(_prune_check, [os.path.join(cfg.base_dir, d) for d in old_dirs]))
+    for entry, (deletable, err) in zip(old_dirs, results):
+        if err is not None:
+            lingering += 1
+            # Report failure to evaluate prune candidate
+            report_sync_failure(err, context=f"prune evaluate {entry}", cli=True, desktop=True)
+        elif deletable:
+            pruned += 1
+            to_remove.append(os.path.join(cfg.base_dir, entry))
+            # Also remove any schedule state entry that referenced this folder
+            for pid, ent in list(proj_state.items()):
+                if ent.get("folder") == entry:
+                    proj_state.pop(pid, None)
+        else:
+            # Mark lingering in schedule state for user attention
+            lingering += 1
+            for pid, ent in proj_state.items():
+                if ent.get("folder") == entry:
+                    ent["pending_delete"] = True
+                    ent["unsynced"] = True
+                    # report the condition so it surfaces in notifications
+                    report_sync_failure(
+                        RuntimeError("Prune skipped (dirty or unpushed): %s" % entry),
+                        context=f"prune candidate {entry}",
+                        cli=True,
+                        desktop=True,
+                    )
+    return pruned, lingering, to_remove
 
 
 def run_sync(cfg: Config):
@@ -45,16 +309,18 @@ def run_sync(cfg: Config):
     if not cfg.git_token:
         raise RuntimeError("Git token is required. Run 'overleaf-pull set-git-token' and retry.")
     if cfg.git_helper:
-        enable_git_helper(platform.system())
+        enable_git_helper(_OS_NAME)
 
     ensure_dir(cfg.base_dir)
+    clear_remote_heads_cache()
     _check_and_update_stale_tokens(cfg)
+    # Fast-fail on no internet before loading cookies or listing projects. Log only; do not adjust timers.
+    if not _has_internet(cfg):
+        _log_manual_offline()
+        raise RuntimeError("No internet connectivity to Overleaf/git; aborted full sync.")
     # Prefer cookies from config if present
-    if cfg.cookies:
-        cookies = cfg.cookies
-    else:
-        cookies = load_overleaf_cookies(cfg.browser, cfg.profile)
-    api = create_api(cfg.host)
+    cookies = cookies_for_config(cfg)
+    api = create_api_cached(cfg.host, cookies)
 
     try:
         projects = list_projects_sorted_by_last_updated(api, cookies, cfg.count)
@@ -62,44 +328,40 @@ def run_sync(cfg: Config):
         report_sync_failure(e, context="list projects", cli=True, desktop=True)
         raise
 
-    # Fast-fail on no internet for manual sync. Log only; do not adjust timers.
-    if not _has_internet(cfg):
-        _log_manual_offline()
-        raise RuntimeError("No internet connectivity to Overleaf/git; aborted full sync.")
     # Load schedule state to adjust timers based on manual sync outcome
     state = load_schedule_state()
     proj_state = state.setdefault("projects", {})
-    import time as _time
-    now = int(_time.time())
+    now = int(time.time())
     MIN_SEC = 1800
     MAX_SEC = 86400
 
     # Compute candidates: union of latest-N from API and any projects that are due now
     api_map = {str(p.get("id")): p for p in projects if p.get("id") is not None}
     api_ids = set(api_map.keys())
+    # Folder per API project, computed once and shared with the prune step below
+    project_folders = {pid: folder_name_for(str(p.get("name", "")), pid) for pid, p in api_map.items()}
     due_ids = {pid for pid, ent in proj_state.items() if int(ent.get("next_due_ts", 0) or 0) <= now}
     candidates = api_ids.union(due_ids)
 
+    due = {}
+    # Due saved projects that left the API set and are safe to delete; removed with
+    # the other pruned repos once state is saved
+    gone = []
     for pid in candidates:
         p = api_map.get(pid)
         # If we have API info, prefer its name; otherwise fall back to saved state
         name = (p.get("name") if p else None) or (proj_state.get(pid) or {}).get("name") or pid
-        folder = (folder_name_for(name, pid) if p else (proj_state.get(pid) or {}).get("folder"))
-        folder = folder or str(pid)
-        repo_dir = os.path.join(cfg.base_dir, folder) if folder else os.path.join(cfg.base_dir, str(pid))
+        folder = project_folders.get(pid) or (proj_state.get(pid) or {}).get("folder") or str(pid)
+        repo_dir = os.path.join(cfg.base_dir, folder)
 
         # If this project is not present in the latest API set, consider it a prune candidate
         if pid not in api_ids:
             # Only attempt prune if repo exists
             if os.path.isdir(os.path.join(repo_dir, ".git")):
                 try:
-                    branch = detect_default_branch(repo_dir)
-                    clean = is_worktree_clean(repo_dir)
-                    ahead = has_unpushed_commits(repo_dir, branch)
+                    clean, ahead, _ = inspect_worktree(repo_dir)
                     if clean and ahead is False:
-                        import shutil
-
-                        shutil.rmtree(repo_dir)
+                        gone.append(folder)
                         # Remove from state if present
                         if pid in proj_state:
                             proj_state.pop(pid, None)
@@ -139,124 +401,74 @@ def run_sync(cfg: Config):
         if next_due > now:
             proj_state[pid] = entry
             continue
-
-        try:
-            # Ensure repo exists and remote configured
-            repo_path = clone_if_missing(cfg.base_dir, folder, pid, cfg.git_token)
-            ensure_remote(repo_path, pid, cfg.git_token)
-            branch = detect_default_branch(repo_path)
-
-            # Compare heads to decide whether to pull
-            rhead = get_remote_branch_head(repo_path, branch)
-            lhead = get_local_branch_head(repo_path, branch)
-            changed = (rhead != lhead) or (not rhead) or (not lhead)
-        except Exception as e:
+        # Saved entries that left the API set (and have no repo to prune) have no lastUpdated
+        last_updated = (p or {}).get("lastUpdated")
+        if _unchanged_since_sync(repo_dir, entry, last_updated):
+            # Not edited on Overleaf since the last sync: no git work, back off as if unchanged
+            _schedule_next(entry, min(interval * 2, MAX_SEC), now)
+            proj_state[pid] = entry
+            continue
+        # Due: sync below in the worker pool; state is only touched from this thread
+        due[pid] = (name, folder, entry, interval, last_updated)
+
+    todo = {pid: _job_args(cfg, pid, d[1], d[2]) for pid, d in due.items()}
+    for pid, pulled, stage, err, branch in _sync_projects(cfg, todo):
+        name, folder, entry, interval, last_updated = due[pid]
+        if stage == "pull":
+            _forget_remote(entry)
+        elif branch:
+            _record_remote(cfg, pid, entry, branch)
+        if err is not None:
             # Report and continue with other candidates; do not raise to avoid aborting the run
-            report_sync_failure(e, context=f"dynamic sync project {name}", cli=True, desktop=True)
-            # bump retry to MIN_SEC to retry soon
-            entry["interval_sec"] = MIN_SEC
-            entry["next_due_ts"] = now + MIN_SEC
+            ctx = "dynamic sync project" if stage == "project" else "dynamic pull"
+            report_sync_failure(err, context=f"{ctx} {name}", cli=True, desktop=True)
+            # Retry soon, backing off while the project keeps failing
+            _schedule_next(entry, _failure_interval(entry, MIN_SEC, MAX_SEC), now)
             proj_state[pid] = entry
             continue
-        if changed:
-            try:
-                pull_remote(repo_path, branch)
-            except Exception as e:
-                report_sync_failure(e, context=f"dynamic pull {name}", cli=True, desktop=True)
-                # schedule a quick retry
-                entry["interval_sec"] = MIN_SEC
-                entry["next_due_ts"] = now + MIN_SEC
-                proj_state[pid] = entry
-                continue
-            
-            interval = MIN_SEC
-        else:
-            interval = min(interval * 2, MAX_SEC)
+        interval = MIN_SEC if pulled else min(interval * 2, MAX_SEC)
 
-        entry["interval_sec"] = interval
-        entry["next_due_ts"] = now + interval
+        entry.pop("consecutive_failures", None)
+        _record_seen(entry, last_updated)
+        _schedule_next(entry, interval, now)
         proj_state[pid] = entry
     # After successful sync of latest set, automatically prune old projects safely
-    expected = {
-        folder_name_for(str(p.get("name", "")), str(p.get("id")))
-        for p in projects
-        if p.get("id") is not None
-    }
-    pruned = 0
-    lingering = 0
-    for entry in os.listdir(cfg.base_dir):
-        path = os.path.join(cfg.base_dir, entry)
-        if os.path.isdir(os.path.join(path, ".git")) and entry not in expected:
-            # Remove only if clean and with no unpushed commits
-            try:
-                branch = detect_default_branch(path)
-                clean = is_worktree_clean(path)
-                ahead = has_unpushed_commits(path, branch)
-                if clean and ahead is False:
-                    import shutil
-
-                    shutil.rmtree(path)
-                    pruned += 1
-                    # Also remove any schedule state entry that referenced this folder
-                    for pid, ent in list(proj_state.items()):
-                        if ent.get("folder") == entry:
-                            proj_state.pop(pid, None)
-                else:
-                    # Mark lingering in schedule state for user attention
-                    lingering += 1
-                    for pid, ent in proj_state.items():
-                        if ent.get("folder") == entry:
-                            ent["pending_delete"] = True
-                            ent["unsynced"] = True
-                            # report the condition so it surfaces in notifications
-                            report_sync_failure(
-                                RuntimeError("Prune skipped (dirty or unpushed): %s" % entry),
-                                context=f"prune candidate {entry}",
-                                cli=True,
-                                desktop=True,
-                            )
-            except Exception as e:
-                lingering += 1
-                # Report failure to evaluate prune candidate
-                report_sync_failure(e, context=f"prune evaluate {entry}", cli=True, desktop=True)
+    expected = set(project_folders.values())
+    # Folders already picked above are not checked a second time
+    pruned, lingering, to_remove = _prune_old_repos(cfg, expected.union(gone), proj_state)
+    pruned += len(gone)
+    to_remove += [os.path.join(cfg.base_dir, folder) for folder in gone]
 
     # Clean up stale schedule entries for repos that are already gone.
     # This keeps status from repeatedly showing deleted repos as pending work.
     for pid, ent in list(proj_state.items()):
         folder = ent.get("folder")
         repo_path = os.path.join(cfg.base_dir, folder) if folder else None
-        repo_exists = bool(repo_path and os.path.isdir(os.path.join(repo_path, ".git")))
-        if ent.get("pending_delete") and not repo_exists:
+        has_repo = bool(repo_path and repo_exists(repo_path))
+        if ent.get("pending_delete") and not has_repo:
             proj_state.pop(pid, None)
-        elif not repo_exists and folder and folder not in expected:
+        elif not has_repo and folder and folder not in expected:
             # Old state for a repo that no longer exists locally.
             proj_state.pop(pid, None)
     # Persist updated schedule state
     save_schedule_state(state)
 
-    msg = f"[{datetime.now().isoformat(timespec='seconds')}] Synced {len(projects)} projects into {cfg.base_dir}"
+    msg = f"[{_log_stamp()}] Synced {len(projects)} projects into {cfg.base_dir}"
     if pruned or lingering:
-        msg += f"; pruned {pruned} old, {lingering} lingering"
+        msg += f"; {pruned} old scheduled for removal, {lingering} lingering"
     print(msg)
     # Append to app log for status checks
-    try:
-        logs_dir = get_logs_dir()
-        with open(os.path.join(logs_dir, "app.log"), "a", encoding="utf-8") as lf:
-            lf.write(msg + "\n")
-    except Exception:
-        pass
+    append_app_log(msg)
+    _remove_repos_later(to_remove)
 
 
 def run_sync_validate_first(cfg: Config):
     if cfg.git_helper:
-        enable_git_helper(platform.system())
+        enable_git_helper(_OS_NAME)
 
     ensure_dir(cfg.base_dir)
-    if cfg.cookies:
-        cookies = cfg.cookies
-    else:
-        cookies = load_overleaf_cookies(cfg.browser, cfg.profile)
-    api = create_api(cfg.host)
+    cookies = cookies_for_config(cfg)
+    api = create_api_cached(cfg.host, cookies)
     try:
         projects = list_projects_sorted_by_last_updated(api, cookies, 1)
     except Exception as e:
@@ -268,12 +480,14 @@ def run_sync_validate_first(cfg: Config):
     pid = p["id"]
     name = p["name"]
     folder = folder_name_for(name, pid)
-    repo_dir = os.path.join(cfg.base_dir, folder)
-    needs_clone = not os.path.isdir(os.path.join(repo_dir, ".git"))
+    repo_path = os.path.join(cfg.base_dir, folder)
+    needs_clone = not repo_exists(repo_path)
     if needs_clone and not cfg.git_token:
         raise RuntimeError("Missing Overleaf Git token for cloning. Run 'overleaf-pull set-git-token'.")
     try:
-        repo_path = clone_if_missing(cfg.base_dir, folder, pid, cfg.git_token)
+        if needs_clone:
+            # Validation only needs auth + a checkout; skip downloading old blobs
+            clone_repo(repo_path, pid, cfg.git_token, partial=True)
         ensure_remote(repo_path, pid, cfg.git_token)
         branch = detect_default_branch(repo_path)
         pull_remote(repo_path, branch)
@@ -284,7 +498,7 @@ def run_sync_validate_first(cfg: Config):
 
 
 def run_sync_once():
-    cfg = load_config() or prompt_first_run()
+    cfg = get_config()
     # Manual run should always sync everything, ignoring timers
     run_sync_once_full(cfg)
 
@@ -299,86 +513,67 @@ def run_sync_once_full(cfg: Config):
     if not cfg.git_token:
         raise RuntimeError("Git token is required. Run 'overleaf-pull set-git-token' and retry.")
     if cfg.git_helper:
-        enable_git_helper(platform.system())
+        enable_git_helper(_OS_NAME)
 
     ensure_dir(cfg.base_dir)
+    clear_remote_heads_cache()
     
     # Proactively check and update remotes with current token to catch stale tokens early
     _check_and_update_stale_tokens(cfg)
     
+    # Fast-fail on no internet before loading cookies or listing projects. Log only; do not adjust timers.
+    if not _has_internet(cfg):
+        _log_manual_offline()
+        raise RuntimeError("No internet connectivity to Overleaf/git; aborted full sync.")
+
     # Prefer cookies from config if present
-    if cfg.cookies:
-        cookies = cfg.cookies
-    else:
-        cookies = load_overleaf_cookies(cfg.browser, cfg.profile)
-    api = create_api(cfg.host)
+    cookies = cookies_for_config(cfg)
+    api = create_api_cached(cfg.host, cookies)
 
     try:
         projects = list_projects_sorted_by_last_updated(api, cookies, cfg.count)
     except Exception as e:
         report_sync_failure(e, context="list projects", cli=True, desktop=True)
         raise
-
-    # Fast-fail on no internet for manual sync. Log only; do not adjust timers.
-    if not _has_internet(cfg):
-        _log_manual_offline()
-        raise RuntimeError("No internet connectivity to Overleaf/git; aborted full sync.")
     
     # Load schedule state to adjust timers based on manual sync outcome
     state = load_schedule_state()
     proj_state = state.setdefault("projects", {})
-    import time as _time
-    now = int(_time.time())
+    now = int(time.time())
     MIN_SEC = 1800
     MAX_SEC = 86400
 
     # For run-once-full, we refresh all API projects regardless of timers
     api_map = {str(p.get("id")): p for p in projects if p.get("id") is not None}
     api_ids = set(api_map.keys())
+    # Folder per API project, computed once and shared with the prune step below
+    project_folders = {pid: folder_name_for(str(p.get("name", "")), pid) for pid, p in api_map.items()}
     # Include all API projects for full refresh
     candidates = api_ids
 
+    todo = {}
     for pid in candidates:
         p = api_map.get(pid)
         # If we have API info, prefer its name; otherwise fall back to saved state
         name = (p.get("name") if p else None) or (proj_state.get(pid) or {}).get("name") or pid
-        folder = (folder_name_for(name, pid) if p else (proj_state.get(pid) or {}).get("folder"))
-        folder = folder or str(pid)
-        repo_dir = os.path.join(cfg.base_dir, folder) if folder else os.path.join(cfg.base_dir, str(pid))
-
-        try:
-            # Ensure repo exists and remote configured
-            repo_path = clone_if_missing(cfg.base_dir, folder, pid, cfg.git_token)
-            ensure_remote(repo_path, pid, cfg.git_token)
-            branch = detect_default_branch(repo_path)
+        folder = project_folders.get(pid) or (proj_state.get(pid) or {}).get("folder") or str(pid)
+        todo[pid] = (name, folder)
 
-            # Compare heads to decide whether to pull
-            rhead = get_remote_branch_head(repo_path, branch)
-            lhead = get_local_branch_head(repo_path, branch)
-            changed = (rhead != lhead) or (not rhead) or (not lhead)
-        except Exception as e:
+    work = {pid: _job_args(cfg, pid, t[1], proj_state.get(pid) or {}) for pid, t in todo.items()}
+    for pid, pulled, stage, err, branch in _sync_projects(cfg, work):
+        name, folder = todo[pid]
+        if err is not None:
             # Report and continue with other candidates; do not raise to avoid aborting the run
-            report_sync_failure(e, context=f"full sync project {name}", cli=True, desktop=True)
-            # bump retry to MIN_SEC to retry soon
+            ctx = "full sync project" if stage == "project" else "full pull"
+            report_sync_failure(err, context=f"{ctx} {name}", cli=True, desktop=True)
+            # Retry soon, backing off while the project keeps failing
             entry = proj_state.setdefault(pid, {})
-            entry["interval_sec"] = MIN_SEC
-            entry["next_due_ts"] = now + MIN_SEC
+            if stage == "pull":
+                _forget_remote(entry)
+            _schedule_next(entry, _failure_interval(entry, MIN_SEC, MAX_SEC), now)
             continue
-        
-        if changed:
-            try:
-                pull_remote(repo_path, branch)
-            except Exception as e:
-                report_sync_failure(e, context=f"full pull {name}", cli=True, desktop=True)
-                # schedule a quick retry
-                entry = proj_state.setdefault(pid, {})
-                entry["interval_sec"] = MIN_SEC
-                entry["next_due_ts"] = now + MIN_SEC
-                continue
-            
-            interval = MIN_SEC
-        else:
-            interval = min(MIN_SEC * 2, MAX_SEC)
+
+        interval = MIN_SEC if pulled else min(MIN_SEC * 2, MAX_SEC)
 
         # Update state for this project
         entry = proj_state.get(pid) or {
@@ -389,79 +584,38 @@ def run_sync_once_full(cfg: Config):
         }
         entry["name"] = name
         entry["folder"] = folder
-        entry["interval_sec"] = interval
-        entry["next_due_ts"] = now + interval
+        entry.pop("consecutive_failures", None)
+        _record_seen(entry, api_map[pid].get("lastUpdated"))
+        _schedule_next(entry, interval, now)
+        if branch:
+            _record_remote(cfg, pid, entry, branch)
         proj_state[pid] = entry
 
     # After successful sync of latest set, automatically prune old projects safely
-    expected = {
-        folder_name_for(str(p.get("name", "")), str(p.get("id")))
-        for p in projects
-        if p.get("id") is not None
-    }
-    pruned = 0
-    lingering = 0
-    for entry in os.listdir(cfg.base_dir):
-        path = os.path.join(cfg.base_dir, entry)
-        if os.path.isdir(os.path.join(path, ".git")) and entry not in expected:
-            # Remove only if clean and with no unpushed commits
-            try:
-                branch = detect_default_branch(path)
-                clean = is_worktree_clean(path)
-                ahead = has_unpushed_commits(path, branch)
-                if clean and ahead is False:
-                    import shutil
-
-                    shutil.rmtree(path)
-                    pruned += 1
-                    # Also remove any schedule state entry that referenced this folder
-                    for pid, ent in list(proj_state.items()):
-                        if ent.get("folder") == entry:
-                            proj_state.pop(pid, None)
-                else:
-                    # Mark lingering in schedule state for user attention
-                    lingering += 1
-                    for pid, ent in proj_state.items():
-                        if ent.get("folder") == entry:
-                            ent["pending_delete"] = True
-                            ent["unsynced"] = True
-                            # report the condition so it surfaces in notifications
-                            report_sync_failure(
-                                RuntimeError("Prune skipped (dirty or unpushed): %s" % entry),
-                                context=f"prune candidate {entry}",
-                                cli=True,
-                                desktop=True,
-                            )
-            except Exception as e:
-                lingering += 1
-                # Report failure to evaluate prune candidate
-                report_sync_failure(e, context=f"prune evaluate {entry}", cli=True, desktop=True)
+    expected = set(project_folders.values())
+    pruned, lingering, to_remove = _prune_old_repos(cfg, expected, proj_state)
 
     # Clean up stale schedule entries for repos that are already gone.
     # This keeps status from repeatedly showing deleted repos as pending work.
     for pid, ent in list(proj_state.items()):
         folder = ent.get("folder")
         repo_path = os.path.join(cfg.base_dir, folder) if folder else None
-        repo_exists = bool(repo_path and os.path.isdir(os.path.join(repo_path, ".git")))
-        if ent.get("pending_delete") and not repo_exists:
+        has_repo = bool(repo_path and repo_exists(repo_path))
+        if ent.get("pending_delete") and not has_repo:
             proj_state.pop(pid, None)
-        elif not repo_exists and folder and folder not in expected:
+        elif not has_repo and folder and folder not in expected:
             # Old state for a repo that no longer exists locally.
             proj_state.pop(pid, None)
     # Persist updated schedule state
     save_schedule_state(state)
 
-    msg = f"[{datetime.now().isoformat(timespec='seconds')}] Full refresh synced {len(projects)} projects into {cfg.base_dir}"
+    msg = f"[{_log_stamp()}] Full refresh synced {len(projects)} projects into {cfg.base_dir}"
     if pruned or lingering:
-        msg += f"; pruned {pruned} old, {lingering} lingering"
+        msg += f"; {pruned} old scheduled for removal, {lingering} lingering"
     print(msg)
     # Append to app log for status checks
-    try:
-        logs_dir = get_logs_dir()
-        with open(os.path.join(logs_dir, "app.log"), "a", encoding="utf-8") as lf:
-            lf.write(msg + "\n")
-    except Exception:
-        pass
+    append_app_log(msg)
+    _remove_repos_later(to_remove)
 
 
 def _check_and_update_stale_tokens(cfg: Config) -> None:
@@ -554,31 +708,23 @@ def due_run(cfg: Config):
         run_sync(cfg)
         return
 
-    import time
-    from .git_ops import (
-        clone_if_missing,
-        ensure_remote,
-        detect_default_branch,
-        pull_remote,
-        get_remote_branch_head,
-        get_local_branch_head,
-        enable_git_helper,
-    )
 
     if not cfg.git_token:
         raise RuntimeError("Git token is required. Run 'overleaf-pull set-git-token' and retry.")
     if cfg.git_helper:
-        enable_git_helper(platform.system())
+        enable_git_helper(_OS_NAME)
 
     ensure_dir(cfg.base_dir)
+    clear_remote_heads_cache()
 
     # Load state early to check if anything is actually due (avoid expensive API call if not)
     state = load_schedule_state()
     proj_state = state.setdefault("projects", {})
     now = int(time.time())
 
+    due_pids = {pid for pid, ent in proj_state.items() if int(ent.get("next_due_ts", 0) or 0) <= now}
     # Treat empty state as due so fresh installs seed the schedule
-    any_due = (not proj_state) or any(int(ent.get("next_due_ts", 0) or 0) <= now for ent in proj_state.values())
+    any_due = (not proj_state) or bool(due_pids)
     if not any_due:
         # Nothing due; skip connectivity check and API calls entirely
         return
@@ -587,8 +733,8 @@ def due_run(cfg: Config):
     if not _has_internet(cfg):
         _log_offline_and_push_timers()
         return
-    cookies = cfg.cookies if cfg.cookies else load_overleaf_cookies(cfg.browser, cfg.profile)
-    api = create_api(cfg.host)
+    cookies = cookies_for_config(cfg)
+    api = create_api_cached(cfg.host, cookies)
     try:
         projects = list_projects_sorted_by_last_updated(api, cookies, cfg.count)
     except Exception as e:
@@ -599,100 +745,128 @@ def due_run(cfg: Config):
 
     synced = 0
     checked = 0
+    first_error = None
+    # Set when any entry is created or changed; idle ticks skip the state write
+    dirty = False
 
+    due = {}
     for p in projects:
         pid = p["id"]
         name = p["name"]
         folder = folder_name_for(name, pid)
-        repo_dir = os.path.join(cfg.base_dir, folder)
-        entry = proj_state.get(pid) or {
-            "name": name,
-            "folder": folder,
-            "interval_sec": MIN_SEC,
-            "next_due_ts": 0,
-        }
-        # Keep name/folder up to date
-        entry["name"] = name
-        entry["folder"] = folder
+        entry = proj_state.get(pid)
+        if entry is None:
+            # New project: due immediately
+            entry = proj_state[pid] = {"name": name, "folder": folder, "interval_sec": MIN_SEC, "next_due_ts": 0}
+            dirty = True
+        else:
+            # Keep name/folder up to date (entry is the stored dict; no reassignment needed)
+            if entry.get("name") != name:
+                entry["name"] = name
+                dirty = True
+            if entry.get("folder") != folder:
+                entry["folder"] = folder
+                dirty = True
+            if pid not in due_pids:
+                # Not due yet; skip heavy checks
+                continue
 
         interval = int(entry.get("interval_sec", MIN_SEC) or MIN_SEC)
-        next_due = int(entry.get("next_due_ts", 0) or 0)
-
-        if next_due > now:
-            # Not due yet; skip heavy checks
+        last_updated = p.get("lastUpdated")
+        if _unchanged_since_sync(os.path.join(cfg.base_dir, folder), entry, last_updated):
+            # Not edited on Overleaf since the last sync: no git work, back off as if unchanged
+            checked += 1
+            _schedule_next(entry, min(interval * 2, MAX_SEC), now)
+            dirty = True
+            continue
+        due[pid] = (name, folder, entry, interval, last_updated)
+
+    todo = {pid: _job_args(cfg, pid, d[1], d[2]) for pid, d in due.items()}
+    dirty = dirty or bool(todo)
+    for pid, pulled, stage, err, branch in _sync_projects(cfg, todo):
+        name, folder, entry, interval, last_updated = due[pid]
+        if stage == "pull":
+            _forget_remote(entry)
+        elif branch:
+            _record_remote(cfg, pid, entry, branch)
+        if err is not None:
+            ctx = "dynamic sync project" if stage == "project" else "dynamic pull"
+            report_sync_failure(err, context=f"{ctx} {name}", cli=True, desktop=True)
+            # Keep the failure's backoff in state; the run still fails once state is saved
+            _schedule_next(entry, _failure_interval(entry, MIN_SEC, MAX_SEC), now)
             proj_state[pid] = entry
+            first_error = first_error or err
             continue
-
-        try:
-            # Ensure repo exists and remote configured
-            repo_path = clone_if_missing(cfg.base_dir, folder, pid, cfg.git_token)
-            ensure_remote(repo_path, pid, cfg.git_token)
-            branch = detect_default_branch(repo_path)
-
-            # Compare heads to decide whether to pull
-            rhead = get_remote_branch_head(repo_path, branch)
-            lhead = get_local_branch_head(repo_path, branch)
-            changed = (rhead != lhead) or (not rhead) or (not lhead)
-        except Exception as e:
-            report_sync_failure(e, context=f"dynamic sync project {name}", cli=True, desktop=True)
-            raise
         checked += 1
-        if changed:
-            try:
-                pull_remote(repo_path, branch)
-            except Exception as e:
-                report_sync_failure(e, context=f"dynamic pull {name}", cli=True, desktop=True)
-                raise
+        if pulled:
             synced += 1
             interval = MIN_SEC
         else:
             interval = min(interval * 2, MAX_SEC)
 
-        entry["interval_sec"] = interval
-        entry["next_due_ts"] = now + interval
+        entry.pop("consecutive_failures", None)
+        _record_seen(entry, last_updated)
+        _schedule_next(entry, interval, now)
         proj_state[pid] = entry
 
     # Persist state
-    save_schedule_state(state)
+    if dirty:
+        save_schedule_state(state)
+    if first_error is not None:
+        raise first_error
 
     # Log summary
-    msg = f"[{datetime.now().isoformat(timespec='seconds')}] Synced {synced} due project(s); checked {checked}; next cadence min 30m"
+    msg = f"[{_log_stamp()}] Synced {synced} due project(s); checked {checked}; next cadence min 30m"
     print(msg)
-    try:
-        logs_dir = get_logs_dir()
-        with open(os.path.join(logs_dir, "app.log"), "a", encoding="utf-8") as lf:
-            lf.write(msg + "\n")
-    except Exception:
-        pass
+    append_app_log(msg)
 
 
 def _log_manual_offline():
     """Log offline condition for manual sync without modifying schedule state."""
-    msg = f"[{datetime.now().isoformat(timespec='seconds')}] Manual sync aborted (no internet)"
+    msg = f"[{_log_stamp()}] Manual sync aborted (no internet)"
     print(msg)
+    append_app_log(msg)
+
+# A positive connectivity probe is trusted for this long (seconds)
+_ONLINE_CACHE_SEC = 60
+_last_online_ts = 0.0
+
+
+def _probe(host: str, port: int, timeout: float) -> bool:
     try:
-        logs_dir = get_logs_dir()
-        with open(os.path.join(logs_dir, "app.log"), "a", encoding="utf-8") as lf:
-            lf.write(msg + "\n")
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
     except Exception:
-        pass
+        return False
+
 
 def _has_internet(cfg: Config, timeout: float = 3.0) -> bool:
-    """Check basic TCP connectivity to Overleaf host and git.overleaf.com."""
+    """Check basic TCP connectivity to Overleaf host and git.overleaf.com.
+
+    Both targets are probed concurrently; the first failure returns False
+    without waiting for the other. Success is cached for _ONLINE_CACHE_SEC.
+    """
+    global _last_online_ts
+
+    if time.monotonic() - _last_online_ts < _ONLINE_CACHE_SEC:
+        return True
     targets = [(cfg.host, 443), ("git.overleaf.com", 443)]
-    for host, port in targets:
-        try:
-            with socket.create_connection((host, port), timeout=timeout):
-                pass
-        except Exception:
-            return False
+    ex = concurrent.futures.ThreadPoolExecutor(max_workers=len(targets))
+    try:
+        futs = [ex.submit(_probe, host, port, timeout) for host, port in targets]
+        for fut in concurrent.futures.as_completed(futs):
+            if not fut.result():
+                return False
+    finally:
+        # Don't block on a still-pending probe once the answer is known
+        ex.shutdown(wait=False)
+    _last_online_ts = time.monotonic()
     return True
 
 
 def _log_offline_and_push_timers():
     """Log offline skip and push due timers forward by their current intervals to avoid immediate retries."""
-    import time as _time
-    now = int(_time.time())
+    now = int(time.time())
     state = load_schedule_state()
     proj_state = state.setdefault("projects", {})
     changed = False
@@ -705,11 +879,6 @@ def _log_offline_and_push_timers():
             changed = True
     if changed:
         save_schedule_state(state)
-    msg = f"[{datetime.now().isoformat(timespec='seconds')}] Runner skipped (no internet); rescheduled due projects in 30m"
+    msg = f"[{_log_stamp()}] Runner skipped (no internet); rescheduled due projects in 30m"
     print(msg)
-    try:
-        logs_dir = get_logs_dir()
-        with open(os.path.join(logs_dir, "app.log"), "a", encoding="utf-8") as lf:
-            lf.write(msg + "\n")
-    except Exception:
-        pass
+    append_app_log(msg)
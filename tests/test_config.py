@@ -0,0 +1,107 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from overleaf_pull import config
+
+
+class ScheduleStateTests(unittest.TestCase):
+    def test_unchanged_state_is_not_rewritten(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "schedule_state.json")
+            with mock.patch.object(config, "get_state_path", return_value=path):
+                config.save_schedule_state({"version": 1, "projects": {"abc": {"next_due_ts": 1}}})
+                state = config.load_schedule_state()
+                os.utime(path, (0, 0))
+
+                config.save_schedule_state(state)
+                self.assertEqual(os.path.getmtime(path), 0)
+
+                state["projects"]["abc"]["next_due_ts"] = 2
+                config.save_schedule_state(state)
+                self.assertNotEqual(os.path.getmtime(path), 0)
+                self.assertEqual(config.load_schedule_state()["projects"]["abc"]["next_due_ts"], 2)
+
+    def test_concurrent_writers_use_separate_temp_files(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "schedule_state.json")
+            with mock.patch.object(config, "get_state_path", return_value=path):
+                threads = [
+                    threading.Thread(target=config.save_schedule_state, args=({"version": 1, "projects": {str(i): {}}},))
+                    for i in range(8)
+                ]
+                for t in threads:
+                    t.start()
+                for t in threads:
+                    t.join()
+
+                self.assertEqual(os.listdir(tmp), ["schedule_state.json"])
+                self.assertEqual(len(config.load_schedule_state()["projects"]), 1)
+
+
+class AtomicWriteTests(unittest.TestCase):
+    def test_writes_text_with_mode_and_cleans_up_on_failure(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "overleaf-pull.timer")
+            config.atomic_write(path, "[Timer]\n", mode=0o644)
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(f.read(), "[Timer]\n")
+            self.assertEqual(os.stat(path).st_mode & 0o777, 0o644)
+
+            with mock.patch.object(config.os, "replace", side_effect=OSError("full")), self.assertRaises(OSError):
+                config.atomic_write(path, b"new")
+            self.assertEqual(os.listdir(tmp), ["overleaf-pull.timer"])
+
+
+class LoadConfigCacheTests(unittest.TestCase):
+    def test_reuses_parse_and_returns_independent_copies(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "config.json")
+            with mock.patch.object(config, "get_config_path", return_value=path):
+                config.save_config(config.Config(base_dir=tmp, cookies={"a": "1"}))
+                first = config.load_config()
+                first.cookies["a"] = "changed"
+                first.count = 99
+                with mock.patch("builtins.open", side_effect=AssertionError("re-read")):
+                    second = config.load_config()
+
+                self.assertEqual(second.count, 10)
+                self.assertEqual(second.cookies, {"a": "1"})
+
+                config.save_config(config.Config(base_dir=tmp, count=3))
+                self.assertEqual(config.load_config().count, 3)
+
+
+class ConfigFromJsonTests(unittest.TestCase):
+    def test_builds_and_saves_config_from_one_blob(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "config.json")
+            base = os.path.join(tmp, "Overleaf")
+            blob = '{"base_dir": "%s", "count": 3, "git_token": "tok"}' % base
+            with mock.patch.object(config, "get_config_path", return_value=path), mock.patch("builtins.print"):
+                cfg = config.config_from_json(blob)
+                self.assertEqual(config.load_config(), cfg)
+                with self.assertRaises(ValueError):
+                    config.config_from_json('{"bogus": 1}')
+
+            self.assertEqual((cfg.count, cfg.git_token, cfg.sync_interval), (3, "tok", "1h"))
+            self.assertTrue(os.path.isdir(base))
+
+    def test_rejects_values_of_the_wrong_type(self) -> None:
+        blobs = {
+            "base_dir": '{"base_dir": 5}',
+            "count": '{"count": "5"}',
+            "git_helper": '{"git_helper": "yes"}',
+            "cookies": '{"cookies": {"overleaf_session2": 1}}',
+            "jobs": '{"jobs": true}',
+        }
+        with mock.patch.object(config, "save_config", side_effect=AssertionError("saved")):
+            for field, blob in blobs.items():
+                with self.subTest(field=field), self.assertRaisesRegex(ValueError, repr(field)):
+                    config.config_from_json(blob)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+from unittest import mock
+
+from overleaf_pull import cookies
+from overleaf_pull.cookies import _to_cookie_dict, parse_cookie_string
+
+
+class ParseCookieStringTests(unittest.TestCase):
+    def test_header_with_prefix_and_whitespace(self) -> None:
+        jar = parse_cookie_string("Cookie: overleaf_session2=abc; GCLB = x=y ;; flag; other=")
+
+        self.assertEqual(jar, {"overleaf_session2": "abc", "GCLB": "x=y", "other": ""})
+
+    def test_single_cookie(self) -> None:
+        self.assertEqual(parse_cookie_string(" overleaf_session2=abc \n"), {"overleaf_session2": "abc"})
+        self.assertEqual(parse_cookie_string("garbage"), {})
+
+
+class CookieDictTests(unittest.TestCase):
+    def test_keeps_only_overleaf_domains(self) -> None:
+        jar = _to_cookie_dict(
+            [
+                {"name": "overleaf_session2", "value": "a", "domain": ".overleaf.com"},
+                {"Name": "GCLB", "Value": "b", "Domain": "www.overleaf.com"},
+                {"name": "other", "value": "c", "domain": "example.com"},
+                {"name": "lookalike", "value": "e", "domain": "evil-overleaf.com"},
+                {"name": "suffixed", "value": "f", "domain": ".overleaf.com.evil.net"},
+                {"name": "nodomain", "value": "d"},
+            ]
+        )
+
+        self.assertEqual(jar, {"overleaf_session2": "a", "GCLB": "b", "nodomain": "d"})
+
+
+class CookieCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        cookies.invalidate_cookie_cache()
+        self.addCleanup(cookies.invalidate_cookie_cache)
+
+    def test_browser_is_read_once_until_invalidated(self) -> None:
+        with mock.patch.object(cookies, "load_overleaf_cookies", return_value={"overleaf_session2": "s"}) as load:
+            first = cookies.load_overleaf_cookies_cached("firefox")
+            first["overleaf_session2"] = "mutated"
+            self.assertEqual(cookies.load_overleaf_cookies_cached("firefox"), {"overleaf_session2": "s"})
+            self.assertEqual(load.call_count, 1)
+
+            cookies.invalidate_cookie_cache()
+            cookies.load_overleaf_cookies_cached("firefox")
+            self.assertEqual(load.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import types
+import unittest
+from unittest import mock
+
+from overleaf_pull import overleaf_api
+
+
+class FakeApi:
+    def __init__(self, host: str = "www.overleaf.com") -> None:
+        self.host = host
+        self.logins = 0
+
+    def login_from_cookies(self, cookies) -> None:
+        self.logins += 1
+
+    def get_projects(self):
+        return [{"id": "abc123", "name": "Paper", "lastUpdated": "2026-06-22T11:09:26"}]
+
+
+class ApiCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        overleaf_api.invalidate_api_cache()
+        self.addCleanup(overleaf_api.invalidate_api_cache)
+
+    def test_same_cookies_reuse_logged_in_api(self) -> None:
+        cookies = {"overleaf_session2": "s", "GCLB": "g"}
+        with mock.patch.object(overleaf_api, "Api", FakeApi):
+            api = overleaf_api.create_api_cached("www.overleaf.com", cookies)
+            again = overleaf_api.create_api_cached("www.overleaf.com", dict(cookies))
+            projects = overleaf_api.list_projects_sorted_by_last_updated(api, cookies, 10)
+
+        self.assertIs(api, again)
+        self.assertEqual(api.logins, 1)
+        self.assertEqual(projects[0]["id"], "abc123")
+
+    def test_changed_cookies_login_again(self) -> None:
+        with mock.patch.object(overleaf_api, "Api", FakeApi):
+            api = overleaf_api.create_api_cached("www.overleaf.com", {"overleaf_session2": "old"})
+            overleaf_api.list_projects_sorted_by_last_updated(api, {"overleaf_session2": "new"}, 10)
+
+        self.assertEqual(api.logins, 2)
+
+
+class ProjectSortTests(unittest.TestCase):
+    def test_sorts_mixed_project_shapes_newest_first(self) -> None:
+        api = FakeApi()
+        api.get_projects = lambda: [
+            types.SimpleNamespace(id="old", name="Old", last_updated="2026-01-01T00:00:00Z"),
+            {"id": "new", "name": "New", "lastUpdated": "2026-03-01T00:00:00Z"},
+            {"id": "none", "name": "No timestamp"},
+            types.SimpleNamespace(id="mid", name="Mid", last_updated="2026-02-01T00:00:00Z"),
+        ]
+
+        projects = overleaf_api.list_projects_sorted_by_last_updated(api, {}, 3)
+
+        self.assertEqual([p["id"] for p in projects], ["new", "mid", "old"])
+        self.assertEqual(projects[1], {"id": "mid", "name": "Mid", "lastUpdated": "2026-02-01T00:00:00Z"})
+
+
+if __name__ == "__main__":
+    unittest.main()
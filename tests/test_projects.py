@@ -0,0 +1,31 @@
+import unittest
+
+from overleaf_pull.projects import SAFE_CHARS, folder_name_for
+
+
+class FolderNameTests(unittest.TestCase):
+    def test_ascii_fast_path_matches_regex(self) -> None:
+        names = [
+            "My Thesis",
+            "a - b",
+            "a  b",
+            "  leading and trailing  ",
+            "._weird__name.-",
+            "x/y\\z:*?",
+            "Paper (v2) [final]!",
+        ]
+        for name in names:
+            with self.subTest(name=name):
+                expected = SAFE_CHARS.sub("-", name).strip("-._") + "-abcdef12"
+                self.assertEqual(folder_name_for(name, "abcdef1234"), expected)
+
+    def test_non_ascii_name(self) -> None:
+        self.assertEqual(folder_name_for("Überblick Ärger", "abcdef1234"), "berblick-rger-abcdef12")
+
+    def test_empty_name_uses_id(self) -> None:
+        self.assertEqual(folder_name_for("", "abcdef1234"), "abcdef1234")
+        self.assertEqual(folder_name_for("***", "abcdef1234"), "-abcdef12")
+
+
+if __name__ == "__main__":
+    unittest.main()
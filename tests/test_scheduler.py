@@ -0,0 +1,25 @@
+import unittest
+
+from overleaf_pull import scheduler
+
+
+class UnitTemplateTests(unittest.TestCase):
+    def test_plist_lists_each_argument_and_interval(self) -> None:
+        plist = scheduler._plist_content(["/usr/bin/overleaf-pull", "run-once-dynamic"], "12h", "/logs")
+
+        self.assertIn("<string>com.overleaf.pull</string>", plist)
+        self.assertIn("\t\t<string>/usr/bin/overleaf-pull</string>\n\t\t<string>run-once-dynamic</string>", plist)
+        self.assertIn("<integer>43200</integer>", plist)
+        self.assertIn("<string>/logs/runner.err.log</string>", plist)
+
+    def test_systemd_units_quote_paths_and_map_interval(self) -> None:
+        service, timer = scheduler._systemd_units(["/opt/my env/bin/python", "-m", "overleaf_pull.cli", "sync"], "30m")
+
+        self.assertIn('ExecStart="/opt/my env/bin/python" -m overleaf_pull.cli sync\n', service)
+        self.assertIn("Description=Run Overleaf Sync periodically (30m)", timer)
+        self.assertIn("OnCalendar=*-*-* *:00,30:00\n", timer)
+        self.assertIn("OnCalendar=daily", scheduler._systemd_units(["x"], "2d")[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
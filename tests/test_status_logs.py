@@ -1,7 +1,11 @@
 from datetime import datetime
+import os
+import tempfile
 import unittest
+from unittest import mock
 
-from overleaf_pull.status import _is_success_line, _success_clears_error
+from overleaf_pull import status
+from overleaf_pull.status import _is_success_line, _success_clears_error, _tail
 
 
 class StatusLogTests(unittest.TestCase):
@@ -22,6 +26,37 @@ class StatusLogTests(unittest.TestCase):
 
         self.assertFalse(_success_clears_error(success_ts, error_ts))
 
+    def test_tail_reads_last_lines_across_blocks(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "app.log")
+            with open(path, "w", encoding="utf-8") as f:
+                for i in range(1000):
+                    f.write(f"[2026-06-22T11:09:26] line {i}\n")
+
+            with mock.patch.object(status, "_TAIL_BLOCK", 128):
+                lines = _tail(path, 200)
+
+        self.assertEqual(len(lines), 200)
+        self.assertEqual(lines[0], "[2026-06-22T11:09:26] line 800")
+        self.assertEqual(lines[-1], "[2026-06-22T11:09:26] line 999")
+
+    def test_tail_of_short_file_returns_every_line(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "app.log")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("first\nsecond")
+
+            self.assertEqual(_tail(path, 50), ["first", "second"])
+
+    def test_last_match_returns_newest_matching_line(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "runner.err.log")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("Traceback (most recent call last):\nModuleNotFoundError: x\n  \nplain\n")
+
+            self.assertEqual(status._scan_runner_err(path), "ModuleNotFoundError: x")
+            self.assertIsNone(status._last_match(path, lambda s: "nope" in s))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,230 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from overleaf_pull import sync
+from overleaf_pull.config import Config
+
+
+class SyncProjectsTests(unittest.TestCase):
+    def test_runs_every_project_and_reports_failures(self) -> None:
+        seen = {}
+
+        def fake_sync_project(cfg, pid, folder, branch, remote_ok):
+            seen[pid] = remote_ok
+            if pid == "bad":
+                return False, "pull", RuntimeError("boom"), branch
+            return pid == "changed", None, None, branch or "master"
+
+        cfg = Config(base_dir="/tmp/unused", jobs=2)
+        todo = {"changed": ("A", None, True), "same": ("B", "main", True), "bad": ("C", None, False)}
+        with mock.patch.object(sync, "_sync_project", side_effect=fake_sync_project):
+            results = {r[0]: (r[1], r[2], r[4]) for r in sync._sync_projects(cfg, todo)}
+
+        self.assertEqual(
+            results,
+            {"changed": (True, None, "master"), "same": (False, None, "main"), "bad": (False, "pull", None)},
+        )
+        self.assertEqual(seen, {"changed": True, "same": True, "bad": False})
+
+    def test_remote_not_ok_runs_ensure_remote(self) -> None:
+        cfg = Config(base_dir="/tmp/unused", git_token="tok")
+        with mock.patch.object(sync, "repo_exists", return_value=True), mock.patch.object(
+            sync, "ensure_remote"
+        ) as ensure, mock.patch.object(sync, "get_remote_branch_head", return_value="abc"), mock.patch.object(
+            sync, "get_local_branch_head", return_value="abc"
+        ):
+            self.assertEqual(sync._sync_project(cfg, "abc123", "Paper", "master", True), (False, None, None, "master"))
+            ensure.assert_not_called()
+            self.assertEqual(sync._sync_project(cfg, "abc123", "Paper", "master", False), (False, None, None, "master"))
+
+        ensure.assert_called_once_with("/tmp/unused/Paper", "abc123", "tok")
+
+    def test_remote_fingerprint_skips_until_token_changes(self) -> None:
+        cfg = Config(base_dir="/tmp/unused", git_token="tok")
+        entry = {}
+        sync._record_remote(cfg, "abc123", entry, "master")
+
+        self.assertEqual(sync._job_args(cfg, "abc123", "Paper", entry), ("Paper", "master", True))
+        self.assertNotIn("tok", entry["remote_fingerprint"])
+        cfg.git_token = "new"
+        self.assertEqual(sync._job_args(cfg, "abc123", "Paper", entry), ("Paper", "master", False))
+
+    def test_fresh_clone_skips_remote_checks_and_pull(self) -> None:
+        cfg = Config(base_dir="/tmp/unused", git_token="tok")
+        with mock.patch.object(sync, "repo_exists", return_value=False), mock.patch.object(
+            sync, "clone_repo"
+        ) as clone, mock.patch.object(sync, "detect_default_branch", return_value="master"), mock.patch.object(
+            sync, "get_remote_branch_head", side_effect=AssertionError("ls-remote")
+        ), mock.patch.object(sync, "pull_remote", side_effect=AssertionError("pull")), mock.patch.object(
+            sync, "ensure_remote", side_effect=AssertionError("ensure_remote")
+        ):
+            result = sync._sync_project(cfg, "abc123", "Paper", "stale", True)
+
+        clone.assert_called_once()
+        self.assertEqual(result, (False, None, None, "master"))
+
+    def test_missing_branch_is_detected_again_and_pulled(self) -> None:
+        cfg = Config(base_dir="/tmp/unused", git_token="tok")
+        missing = sync.RemoteBranchMissingError("git pull failed: couldn't find remote ref master")
+        with mock.patch.object(sync, "repo_exists", return_value=True), mock.patch.object(
+            sync, "get_remote_branch_head", return_value=None
+        ), mock.patch.object(sync, "get_local_branch_head", return_value="abc"), mock.patch.object(
+            sync, "detect_default_branch", return_value="main"
+        ), mock.patch.object(sync, "pull_remote", side_effect=[missing, None]) as pull:
+            result = sync._sync_project(cfg, "abc123", "Paper", "master", True)
+
+        self.assertEqual([c.args[1] for c in pull.call_args_list], ["master", "main"])
+        self.assertEqual(result, (True, None, None, "main"))
+
+    def test_unchanged_last_updated_skips_only_existing_repos(self) -> None:
+        entry = {}
+        sync._record_seen(entry, "2026-06-22T11:09:26")
+
+        with mock.patch.object(sync, "repo_exists", return_value=True):
+            self.assertTrue(sync._unchanged_since_sync("/tmp/unused/Paper", entry, "2026-06-22T11:09:26"))
+            self.assertFalse(sync._unchanged_since_sync("/tmp/unused/Paper", entry, "2026-06-23T08:00:00"))
+            self.assertFalse(sync._unchanged_since_sync("/tmp/unused/Paper", entry, None))
+        with mock.patch.object(sync, "repo_exists", return_value=False):
+            self.assertFalse(sync._unchanged_since_sync("/tmp/unused/Paper", entry, "2026-06-22T11:09:26"))
+
+
+class RunSyncTests(unittest.TestCase):
+    def run_sync(self, state: dict, projects: list, fake_sync_project) -> dict:
+        """Run run_sync against a temporary base_dir; returns the saved schedule state."""
+        saved = {}
+        with tempfile.TemporaryDirectory() as tmp, contextlib.ExitStack() as stack:
+            cfg = Config(base_dir=tmp, git_token="tok", git_helper=False, jobs=2)
+            for name, value in {
+                "_check_and_update_stale_tokens": None,
+                "_has_internet": True,
+                "cookies_for_config": {},
+                "create_api_cached": None,
+                "list_projects_sorted_by_last_updated": projects,
+                "load_schedule_state": state,
+                "append_app_log": None,
+            }.items():
+                stack.enter_context(mock.patch.object(sync, name, return_value=value))
+            stack.enter_context(mock.patch.object(sync, "_sync_project", side_effect=fake_sync_project))
+            stack.enter_context(mock.patch.object(sync, "save_schedule_state", side_effect=saved.update))
+            stack.enter_context(contextlib.redirect_stdout(io.StringIO()))
+            sync.run_sync(cfg)
+        return saved
+
+    def test_due_entry_missing_from_api_without_repo_is_cloned_again(self) -> None:
+        calls = []
+
+        def fake_sync_project(cfg, pid, folder, branch, remote_ok):
+            calls.append(pid)
+            return False, None, None, "master"
+
+        state = {"projects": {"gonepid": {"name": "Gone", "folder": "Gone-gonepid", "next_due_ts": 0}}}
+        saved = self.run_sync(state, [{"id": "p1", "name": "Paper", "lastUpdated": "t1"}], fake_sync_project)
+
+        self.assertEqual(sorted(calls), ["gonepid", "p1"])
+        self.assertEqual(saved["projects"]["p1"]["last_updated_seen"], "t1")
+
+    def test_failed_pull_drops_cached_branch_after_default_branch_change(self) -> None:
+        branches = []
+
+        def fake_sync_project(cfg, pid, folder, branch, remote_ok):
+            branches.append(branch)
+            if branch == "master":
+                return False, "pull", RuntimeError("fatal: couldn't find remote ref master"), branch
+            return True, None, None, "main"
+
+        cfg = Config(base_dir="/unused", git_token="tok")
+        entry = {"name": "Paper", "folder": "Paper-p1", "next_due_ts": 0}
+        sync._record_remote(cfg, "p1", entry, "master")
+        state = {"projects": {"p1": entry}}
+        projects = [{"id": "p1", "name": "Paper", "lastUpdated": "t1"}]
+        with mock.patch.object(sync, "report_sync_failure"):
+            saved = self.run_sync(state, projects, fake_sync_project)
+        self.assertNotIn("default_branch", saved["projects"]["p1"])
+        self.assertNotIn("remote_fingerprint", saved["projects"]["p1"])
+
+        saved["projects"]["p1"]["next_due_ts"] = 0
+        saved = self.run_sync(saved, projects, fake_sync_project)
+        self.assertEqual(branches, ["master", None])
+        self.assertEqual(saved["projects"]["p1"]["default_branch"], "main")
+
+
+class RemoveReposTests(unittest.TestCase):
+    def test_logs_each_failure_and_the_failed_count(self) -> None:
+        def fake_rmtree(path, onexc=None, onerror=None):
+            if path.endswith("bad"):
+                exc = PermissionError("denied")
+                if onexc is not None:
+                    onexc(os.unlink, path + "/x", exc)
+                else:
+                    onerror(os.unlink, path + "/x", (PermissionError, exc, None))
+
+        with mock.patch.object(sync.shutil, "rmtree", side_effect=fake_rmtree), mock.patch.object(
+            sync, "append_app_log"
+        ) as log:
+            sync._remove_repos_later(["/base/ok", "/base/bad"])
+            sync._wait_for_pending_removals()
+
+        lines = [c.args[0] for c in log.call_args_list]
+        self.assertEqual(len(lines), 2)
+        self.assertIn("could not remove /base/bad/x: denied", lines[0])
+        self.assertIn("failed to remove 1 of 2", lines[1])
+
+
+class BackoffTests(unittest.TestCase):
+    def test_jitter_stays_within_a_quarter_interval(self) -> None:
+        entry = {}
+        for _ in range(50):
+            sync._schedule_next(entry, 1800, 1000)
+            self.assertEqual(entry["interval_sec"], 1800)
+            self.assertTrue(1000 + 1800 <= entry["next_due_ts"] <= 1000 + 1800 + 450)
+
+    def test_consecutive_failures_double_up_to_cap(self) -> None:
+        entry = {}
+        intervals = [sync._failure_interval(entry, 1800, 86400) for _ in range(8)]
+
+        self.assertEqual(intervals[:3], [1800, 3600, 7200])
+        self.assertEqual(intervals[-1], 86400)
+        self.assertEqual(entry["consecutive_failures"], 8)
+
+
+class HasInternetTests(unittest.TestCase):
+    def setUp(self) -> None:
+        sync._last_online_ts = 0.0
+        self.addCleanup(setattr, sync, "_last_online_ts", 0.0)
+
+    def test_failure_is_not_cached_and_success_is(self) -> None:
+        cfg = Config(base_dir="/tmp/unused")
+        with mock.patch.object(sync, "_probe", return_value=False):
+            self.assertFalse(sync._has_internet(cfg))
+        with mock.patch.object(sync, "_probe", return_value=True) as probe:
+            self.assertTrue(sync._has_internet(cfg))
+            self.assertTrue(sync._has_internet(cfg))
+        self.assertEqual(probe.call_count, 2)
+
+
+class PluggedInTests(unittest.TestCase):
+    def setUp(self) -> None:
+        sync._power_cache = None
+        self.addCleanup(setattr, sync, "_power_cache", None)
+
+    def test_battery_state_is_cached(self) -> None:
+        fake = mock.Mock()
+        fake.sensors_battery.return_value = mock.Mock(power_plugged=False)
+        with mock.patch.object(sync, "psutil", fake):
+            self.assertFalse(sync.is_plugged_in())
+            self.assertFalse(sync.is_plugged_in())
+        self.assertEqual(fake.sensors_battery.call_count, 1)
+
+    def test_missing_battery_counts_as_plugged_in(self) -> None:
+        fake = mock.Mock()
+        fake.sensors_battery.return_value = None
+        with mock.patch.object(sync, "psutil", fake):
+            self.assertTrue(sync.is_plugged_in())
+
+
+if __name__ == "__main__":
+    unittest.main()